@@ -0,0 +1,370 @@
+"""Offline throughput benchmark of the feed-processing pipeline.
+
+Serves the saved RSS/Atom fixtures (of various sizes and languages) from a local
+HTTP server, or reads them from disk, processes each one with parse_and_process_feed
+and reports the entries/sec, the per-stage latency percentiles and the peak RSS.
+Nothing is downloaded: the models are either tiny randomly-initialized stand-ins
+(the default, measuring the pipeline's own overhead) or the real ones from the
+local Hugging Face cache.
+
+Run from the project's root directory:
+
+    python benchmarks/bench_pipeline.py [--models tiny|cached] [--repeats 3] [--output results.json]
+        [--baseline previous.json]
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import perf_counter
+
+# Models are only ever read from the local cache
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import feedparser  # noqa: E402
+import torch  # noqa: E402
+import transformers  # noqa: E402
+
+from tokenizers import Tokenizer, models, pre_tokenizers, processors  # noqa: E402
+from transformers import (  # noqa: E402
+    BartConfig,
+    BartForConditionalGeneration,
+    PreTrainedTokenizerFast,
+)
+
+from config import MODEL_BACKEND, MODEL_PRECISION, STREAM_CHUNK_SIZE  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from task_management import (  # noqa: E402
+    MULTILINGUAL_SUMMARIZATION_MODEL_KEY,
+    SUMMARIZATION_MODEL_KEY,
+    TRANSLATION_MODEL_KEY,
+    TaskManager,
+    model_registry,
+)
+from text_extraction import extract_text_lxml  # noqa: E402
+
+
+FEEDS_DIR = Path(__file__).resolve().parent / "fixtures" / "feeds"
+
+# The fixture feeds and their languages
+FEEDS = {
+    "small_en.rss": "en",
+    "medium_el.atom": "el",
+    "medium_fr.rss": "fr",
+    "large_en.atom": "en",
+}
+
+SPECIAL_TOKENS = ["<s>", "<pad>", "</s>", "<unk>"]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_fixtures() -> ThreadingHTTPServer:
+    """Serve the fixture feeds over HTTP on a free local port"""
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(_QuietHandler, directory=str(FEEDS_DIR))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _tiny_tokenizer() -> PreTrainedTokenizerFast:
+    """Word-level tokenizer over the vocabulary of the fixture feeds"""
+    pre_tokenizer = pre_tokenizers.Whitespace()
+    words = set()
+    for name in FEEDS:
+        for entry in feedparser.parse(str(FEEDS_DIR / name)).entries:
+            for txt in (
+                entry.get("title", ""),
+                extract_text_lxml(entry.get("summary", "")),
+            ):
+                words.update(word for word, _ in pre_tokenizer.pre_tokenize_str(txt))
+
+    vocab = {token: i for i, token in enumerate(SPECIAL_TOKENS + sorted(words))}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizer
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", special_tokens=[("<s>", 0), ("</s>", 2)]
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        bos_token="<s>",
+        pad_token="<pad>",
+        eos_token="</s>",
+        unk_token="<unk>",
+    )
+
+
+def _tiny_model(vocab_size: int) -> BartForConditionalGeneration:
+    torch.manual_seed(0)
+    config = BartConfig(
+        vocab_size=vocab_size,
+        d_model=64,
+        encoder_layers=2,
+        decoder_layers=2,
+        encoder_attention_heads=4,
+        decoder_attention_heads=4,
+        encoder_ffn_dim=128,
+        decoder_ffn_dim=128,
+        max_position_embeddings=1024,
+        pad_token_id=1,
+        bos_token_id=0,
+        eos_token_id=2,
+        decoder_start_token_id=2,
+        forced_eos_token_id=2,
+    )
+    return BartForConditionalGeneration(config).eval()
+
+
+class _TinyTranslator:
+    """Stand-in for the translation pipeline, generating with a tiny random model"""
+
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+
+    def __call__(self, txts, src_lang, tgt_lang, batch_size=1, **kwargs):
+        inputs = self.tokenizer(
+            txts, padding=True, truncation=True, max_length=1024, return_tensors="pt"
+        )
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                num_beams=1,
+                min_new_tokens=4,
+                max_new_tokens=64,
+                suppress_tokens=[0, 1, 3],
+            )
+        return [
+            {"translation_text": txt}
+            for txt in self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        ]
+
+
+def _tiny_registry() -> ModelRegistry:
+    """Registry of tiny randomly-initialized models, with the shapes of the real ones' outputs"""
+    # Each model has its own tokenizer, as their padding settings are not thread-safe
+    tokenizer, translation_tokenizer = _tiny_tokenizer(), _tiny_tokenizer()
+    summarizer = _tiny_model(len(tokenizer))
+    translator = _TinyTranslator(
+        _tiny_model(len(translation_tokenizer)), translation_tokenizer
+    )
+
+    # The generation lengths of facebook/bart-large-cnn
+    config = copy.deepcopy(summarizer.config)
+    config.max_length, config.min_length = 142, 56
+
+    summarization = {
+        "config": config,
+        "model": summarizer,
+        "tokenizer": tokenizer,
+        "device": torch.device("cpu"),
+    }
+    registry = ModelRegistry()
+    registry.register(SUMMARIZATION_MODEL_KEY, lambda: summarization)
+    registry.register(MULTILINGUAL_SUMMARIZATION_MODEL_KEY, lambda: summarization)
+    registry.register(
+        TRANSLATION_MODEL_KEY,
+        lambda: {"pipeline": translator, "device": torch.device("cpu")},
+    )
+    return registry
+
+
+def _time_stages(task_manager: TaskManager, latencies) -> None:
+    """Record the latency of every run of each pipeline stage"""
+
+    def timed(name, stage):
+        def run(batch):
+            ts = perf_counter()
+            try:
+                return stage(batch)
+            finally:
+                latencies[name].append(perf_counter() - ts)
+
+        return run
+
+    task_manager.pipeline.stages = [
+        (name, timed(name, stage)) for name, stage in task_manager.pipeline.stages
+    ]
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+
+    def at(q):
+        return samples[min(len(samples) - 1, round(q * (len(samples) - 1)))]
+
+    return {
+        "count": len(samples),
+        "p50_ms": at(0.5) * 1000,
+        "p90_ms": at(0.9) * 1000,
+        "p99_ms": at(0.99) * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_comparison(results, baseline):
+    print(f"\n{'vs baseline':<20} {'entries/s':>12} {'change':>8}")
+    for name, feed in results["feeds"].items():
+        previous = baseline["feeds"].get(name)
+        if previous:
+            change = feed["entries_per_sec"] / previous["entries_per_sec"] - 1
+            print(f"{name:<20} {feed['entries_per_sec']:>12.2f} {change:>+8.1%}")
+
+    print(f"\n{'vs baseline':<20} {'p50 ms':>12} {'change':>8}")
+    for name, stage in results["stages"].items():
+        previous = baseline["stages"].get(name)
+        if previous:
+            # Stages skipped by the run (e.g. pre_translate with the pivot language) take ~0 ms
+            change = (
+                f"{stage['p50_ms'] / previous['p50_ms'] - 1:>+8.1%}"
+                if previous["p50_ms"] >= 0.1
+                else f"{'n/a':>8}"
+            )
+            print(f"{name:<20} {stage['p50_ms']:>12.1f} {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", choices=["tiny", "cached"], default="tiny")
+    parser.add_argument("--transport", choices=["http", "file"], default="http")
+    parser.add_argument("--feeds", nargs="+", choices=list(FEEDS), default=list(FEEDS))
+    parser.add_argument("--tgt-lang", default="de")
+    parser.add_argument("--strategy", default="pivot")
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="JSON file the results are written to")
+    parser.add_argument(
+        "--baseline", help="JSON results of a previous run to compare to"
+    )
+    args = parser.parse_args()
+
+    registry = _tiny_registry() if args.models == "tiny" else model_registry
+    # No result cache nor feed state, so that every repeat runs the whole pipeline
+    tm = TaskManager(registry=registry, strategy=args.strategy)
+    tm.warm_up()
+
+    server = _serve_fixtures() if args.transport == "http" else None
+
+    def feed_url(name):
+        if server is None:
+            return str(FEEDS_DIR / name)
+        return f"http://127.0.0.1:{server.server_address[1]}/{name}"
+
+    # A first, unmeasured, run of the smallest feed warms up the models
+    tm.parse_and_process_feed(
+        feed_url(args.feeds[0]), FEEDS[args.feeds[0]], args.tgt_lang
+    )
+
+    latencies = defaultdict(list)
+    _time_stages(tm, latencies)
+
+    feeds = {}
+    for name in args.feeds:
+        url, src_lang = feed_url(name), FEEDS[name]
+        seconds, num_entries = [], 0
+        for _ in range(args.repeats):
+            # Fetching and parsing, as done by the task manager, measured on its own
+            ts = perf_counter()
+            feedparser.parse(url)
+            latencies["fetch_parse"].append(perf_counter() - ts)
+
+            ts = perf_counter()
+            num_entries = sum(
+                len(chunk)
+                for chunk in tm.iter_parse_and_process_feed(
+                    url, src_lang, args.tgt_lang, chunk_size=args.chunk_size
+                )
+            )
+            seconds.append(perf_counter() - ts)
+
+        feeds[name] = {
+            "src_lang": src_lang,
+            "entries": num_entries,
+            "entries_per_sec": num_entries * len(seconds) / sum(seconds),
+            **_percentiles(seconds),
+        }
+
+    if server is not None:
+        server.shutdown()
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "models": args.models,
+            "strategy": args.strategy,
+            "precision": MODEL_PRECISION,
+            "backend": MODEL_BACKEND,
+            "tgt_lang": args.tgt_lang,
+            "chunk_size": args.chunk_size,
+            "repeats": args.repeats,
+            "torch_threads": torch.get_num_threads(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "transformers": transformers.__version__,
+        },
+        "feeds": feeds,
+        "stages": {name: _percentiles(samples) for name, samples in latencies.items()},
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+    print(f"{'feed':<20} {'entries':>8} {'entries/s':>10} {'p50 s':>8} {'max s':>8}")
+    for name, feed in feeds.items():
+        print(
+            f"{name:<20} {feed['entries']:>8} {feed['entries_per_sec']:>10.2f}"
+            f" {feed['p50_ms'] / 1000:>8.2f} {feed['max_ms'] / 1000:>8.2f}"
+        )
+    print(f"\n{'stage':<20} {'runs':>8} {'p50 ms':>10} {'p90 ms':>8} {'p99 ms':>8}")
+    for name, stage in results["stages"].items():
+        print(
+            f"{name:<20} {stage['count']:>8} {stage['p50_ms']:>10.1f}"
+            f" {stage['p90_ms']:>8.1f} {stage['p99_ms']:>8.1f}"
+        )
+    print(f"\npeak RSS: {results['peak_rss_mb']:.0f} MB")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            _print_comparison(results, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Quality-vs-speed report of the model precision modes, compared to fp32.
+
+Summarizes and translates a fixed sample (the saved feed HTML fixtures) with the
+models loaded in each precision, and reports the latency, the serialized model size
+and how close the outputs are to the fp32 ones.
+
+Run from the project's root directory:
+
+    python benchmarks/bench_precision.py [--precisions fp32 int8 bf16] [--output report.json]
+"""
+
+import argparse
+import io
+import json
+import sys
+
+from difflib import SequenceMatcher
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import torch  # noqa: E402
+
+from model_registry import ModelRegistry  # noqa: E402
+from task_management import (  # noqa: E402
+    SUMMARIZATION_MODEL_KEY,
+    TRANSLATION_MODEL_KEY,
+    TaskManager,
+    _load_summarization_model,
+    _load_translation_model,
+)
+from text_extraction import extract_text_lxml  # noqa: E402
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "html"
+
+
+def _model_size_mb(model: torch.nn.Module) -> float:
+    # Serialized state size also accounts for packed (quantized) weights
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 2**20
+
+
+def _timed(func, *args, **kw):
+    ts = perf_counter()
+    result = func(*args, **kw)
+    return result, perf_counter() - ts
+
+
+def _similarity(outputs, reference_outputs):
+    ratios = [
+        SequenceMatcher(None, output, reference).ratio()
+        for output, reference in zip(outputs, reference_outputs)
+    ]
+    exact = sum(o == r for o, r in zip(outputs, reference_outputs))
+    return sum(ratios) / len(ratios), exact / len(ratios)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8", "bf16"])
+    parser.add_argument("--tgt-lang", default="French")
+    parser.add_argument("--output", help="JSON file the report is written to")
+    args = parser.parse_args()
+
+    # fp32 outputs are the reference the other precisions are compared to
+    precisions = ["fp32"] + [p for p in args.precisions if p != "fp32"]
+
+    sample = [
+        extract_text_lxml(path.read_text(encoding="utf-8"))
+        for path in sorted(FIXTURES_DIR.glob("*.html"))
+    ]
+
+    report, reference = {}, None
+    for precision in precisions:
+        registry = ModelRegistry()
+        registry.register(
+            SUMMARIZATION_MODEL_KEY, partial(_load_summarization_model, precision)
+        )
+        registry.register(
+            TRANSLATION_MODEL_KEY, partial(_load_translation_model, precision)
+        )
+        tm = TaskManager(registry=registry)
+        tm.warm_up()
+
+        summaries, summarize_seconds = _timed(tm.summarize_batch, sample)
+        translations, translate_seconds = _timed(
+            tm.translate_batch, summaries, "English", args.tgt_lang
+        )
+        outputs = {"summaries": summaries, "translations": translations}
+        reference = reference or outputs
+
+        summary_similarity, summary_exact = _similarity(
+            summaries, reference["summaries"]
+        )
+        translation_similarity, translation_exact = _similarity(
+            translations, reference["translations"]
+        )
+
+        report[precision] = {
+            "summarizer_size_mb": _model_size_mb(tm.summarizer),
+            "translator_size_mb": _model_size_mb(tm.translator.model),
+            "summarize_seconds": summarize_seconds,
+            "translate_seconds": translate_seconds,
+            "summary_similarity": summary_similarity,
+            "summary_exact_match": summary_exact,
+            "translation_similarity": translation_similarity,
+            "translation_exact_match": translation_exact,
+            "outputs": outputs,
+        }
+        tm.unload()
+
+    header = f"{'precision':<10} {'sum MB':>8} {'tr MB':>8} {'sum s':>8} {'tr s':>8} {'sum sim':>8} {'tr sim':>8}"
+    print(header)
+    for precision, result in report.items():
+        print(
+            f"{precision:<10} {result['summarizer_size_mb']:>8.0f} {result['translator_size_mb']:>8.0f}"
+            f" {result['summarize_seconds']:>8.2f} {result['translate_seconds']:>8.2f}"
+            f" {result['summary_similarity']:>8.3f} {result['translation_similarity']:>8.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
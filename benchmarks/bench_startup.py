@@ -0,0 +1,117 @@
+"""Cold start measurement of the application, against its time budget.
+
+Launches the app in a subprocess and measures the seconds until the interface
+accepts requests and until the app reports being ready (models loaded), along
+with the duration of each startup step, as exported on the metrics endpoint.
+Exits with a non-zero status if readiness takes longer than the budget.
+
+Run from the project's root directory:
+
+    python benchmarks/bench_startup.py [--budget 120] [--output cold_start.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+
+from pathlib import Path
+from time import perf_counter, sleep
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+sys.path.insert(0, str(SRC_DIR))
+
+from config import STARTUP_BUDGET  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, ""
+    except OSError:
+        return None, ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", help="JSON file the measurements are written to")
+    args = parser.parse_args()
+
+    ui_port, metrics_port = _free_port(), _free_port()
+    env = dict(
+        os.environ,
+        GRADIO_SERVER_PORT=str(ui_port),
+        TRANSUM_METRICS_PORT=str(metrics_port),
+        TRANSUM_API_PORT="0",
+    )
+
+    ts = perf_counter()
+    app = subprocess.Popen(
+        [sys.executable, "transum_app.py"],
+        cwd=SRC_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    ui_seconds = ready_seconds = None
+    try:
+        while perf_counter() - ts < args.timeout and app.poll() is None:
+            if ui_seconds is None and _get(f"http://127.0.0.1:{ui_port}/")[0] == 200:
+                ui_seconds = perf_counter() - ts
+            if _get(f"http://127.0.0.1:{metrics_port}/ready")[0] == 200:
+                ready_seconds = perf_counter() - ts
+                break
+            sleep(0.1)
+
+        _, metrics = _get(f"http://127.0.0.1:{metrics_port}/metrics")
+    finally:
+        app.terminate()
+        app.wait()
+
+    steps = {
+        step: float(seconds)
+        for step, seconds in re.findall(
+            r'^transum_startup_step_seconds\{step="([^"]+)"\} (\S+)$', metrics, re.M
+        )
+    }
+    results = {
+        "ui_seconds": ui_seconds,
+        "ready_seconds": ready_seconds,
+        "step_seconds": steps,
+        "budget_seconds": args.budget,
+        "within_budget": ready_seconds is not None and ready_seconds <= args.budget,
+    }
+
+    print(f"interface up:  {ui_seconds or float('nan'):>8.2f} sec")
+    for step, seconds in steps.items():
+        print(f"  {step:<12} {seconds:>8.2f} sec")
+    print(
+        f"ready:         {ready_seconds or float('nan'):>8.2f} sec (budget {args.budget:.0f} sec)"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(0 if results["within_budget"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Micro-benchmark of the text extractors over the saved feed HTML fixtures.
+
+Run from the project's root directory:
+
+    python benchmarks/bench_text_extraction.py [--repeat N]
+"""
+
+import argparse
+import sys
+
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from text_extraction import TEXT_EXTRACTORS  # noqa: E402
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "html"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(FIXTURES_DIR.glob("*.html"))
+    }
+
+    print(f"{'fixture':<20} {'extractor':<10} {'us/doc':>10} {'speedup':>8}")
+    for name, content in corpus.items():
+        baseline = None
+        for extractor_name in ("bs4", "lxml"):
+            extract_text = TEXT_EXTRACTORS[extractor_name]
+
+            ts = perf_counter()
+            for _ in range(args.repeat):
+                extract_text(content)
+            per_doc = (perf_counter() - ts) / args.repeat
+
+            baseline = baseline or per_doc
+            print(
+                f"{name:<20} {extractor_name:<10} {per_doc * 1e6:>10.1f} {baseline / per_doc:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import os
+
+
 LANGUAGES = {
     "el": "Greek",
     "en": "English",
@@ -81,3 +84,131 @@ LANG_LEX_2_CODE = {
 #     "ur": "خلاصہ: ",  # Urdu
 #     # Add more languages as needed
 # }
+
+
+# Models used for the summarization and translation tasks
+SUMMARIZATION_MODEL_NAME = "facebook/bart-large-cnn"
+TRANSLATION_MODEL_NAME = "facebook/nllb-200-distilled-1.3B"
+
+# Summarization model for non-English contents, used by the "multilingual" processing strategy
+MULTILINGUAL_SUMMARIZATION_MODEL_NAME = "csebuetnlp/mT5_multilingual_XLSum"
+
+# Languages each summarization model summarizes directly, contents in other languages
+# are translated to English and summarized by the English model, whatever the strategy
+SUMMARIZATION_MODEL_LANGUAGES = {
+    SUMMARIZATION_MODEL_NAME: ("English",),
+    MULTILINGUAL_SUMMARIZATION_MODEL_NAME: (
+        "Arabic",
+        "Chinese",
+        "English",
+        "French",
+        "Hindi",
+        "Indonesian",
+        "Japanese",
+        "Korean",
+        "Portuguese",
+        "Russian",
+        "Spanish",
+        "Tamil",
+        "Telugu",
+        "Thai",
+        "Turkish",
+        "Ukrainian",
+        "Urdu",
+        "Vietnamese",
+    ),
+}
+
+# Processing strategy of non-English feeds: "pivot" (through English) or "multilingual"
+PROCESSING_STRATEGY = os.getenv("TRANSUM_PROCESSING_STRATEGY", "pivot")
+
+# Precision the models are loaded in: "fp32", "bf16" or "int8" (dynamic quantization, CPU only)
+MODEL_PRECISION = os.getenv("TRANSUM_MODEL_PRECISION", "fp32")
+
+# Backend running the models: "pytorch", or "onnx" (ONNX Runtime, CPU, requires optimum[onnxruntime])
+MODEL_BACKEND = os.getenv("TRANSUM_MODEL_BACKEND", "pytorch")
+
+# Directory the models exported for the onnx backend are cached in
+ONNX_EXPORT_DIR = os.getenv("TRANSUM_ONNX_EXPORT_DIR", "onnx_models")
+
+# Max number of texts per summarization generation batch
+SUMMARIZATION_BATCH_SIZE = 8
+
+# Max number of model-input-sized chunks a long text is summarized in (the rest is dropped)
+SUMMARIZATION_MAX_CHUNKS = 6
+
+# Max number of texts per translation batch
+TRANSLATION_BATCH_SIZE = 10
+
+# Generation policy, trading summary and translation quality for latency per input:
+# texts already within the summary's max length are kept as they are, short inputs
+# (in tokens) are summarized greedily, interactive requests with at most the given beams,
+# and translations are capped to a multiple of their source tokens (plus a margin),
+# within the translation model's max length
+SUMMARIZATION_NUM_BEAMS = 4
+SUMMARIZATION_SHORT_INPUT_TOKENS = 128
+SUMMARIZATION_SHORT_NUM_BEAMS = 1
+SUMMARIZATION_INTERACTIVE_NUM_BEAMS = 2
+TRANSLATION_LENGTH_RATIO = 2.0
+TRANSLATION_LENGTH_MARGIN = 16
+
+
+# Result cache of summaries and translations (in-memory LRU tier and on-disk SQLite tier)
+CACHE_DB_PATH = os.getenv("TRANSUM_CACHE_DB", "transum_cache.sqlite3")
+CACHE_MEMORY_MAX_ENTRIES = 2048
+CACHE_DISK_MAX_ENTRIES = 100000
+
+# Store of feed validators (ETag/Last-Modified) and already processed feed entries
+FEED_STATE_DB_PATH = os.getenv("TRANSUM_FEED_STATE_DB", "transum_feed_state.sqlite3")
+
+# Max number of entries per chunk, when streaming processed feed entries
+STREAM_CHUNK_SIZE = SUMMARIZATION_BATCH_SIZE
+
+# Concurrent fetching and parsing (in threads) of many feeds
+FETCH_TIMEOUT = 10.0  # seconds
+FETCH_MAX_CONNECTIONS = 20
+FETCH_PER_HOST_LIMIT = 4
+PARSE_WORKERS = 4
+
+# Max number of entry chunks waiting between consecutive processing stages
+PIPELINE_QUEUE_SIZE = 2
+
+# Extractor of the text from the entries' HTML contents ("lxml", or "bs4" for BeautifulSoup)
+TEXT_EXTRACTOR = os.getenv("TRANSUM_TEXT_EXTRACTOR", "lxml")
+
+# Background polling of the subscribed feeds (JSON list of rss_url, src_lang, tgt_lang, optional interval)
+SUBSCRIPTIONS_FILE = os.getenv("TRANSUM_SUBSCRIPTIONS_FILE", "subscriptions.json")
+POLL_DEFAULT_INTERVAL = 900  # seconds
+POLL_JITTER = 0.1  # fraction of the interval
+POLL_INFERENCE_BUDGET = 30  # max seconds of feed processing per budget window
+POLL_BUDGET_WINDOW = 60  # seconds
+
+# Queue of feed processing jobs, identical in-flight requests are coalesced
+JOB_QUEUE_MAX_DEPTH = 32  # max number of jobs waiting, new ones are rejected beyond it
+JOB_QUEUE_WORKERS = 1  # number of jobs running concurrently
+
+# Micro-batching of the model calls of concurrent requests, off by default: with a single
+# job queue worker, model calls never run concurrently and only wait for a batch to fill
+MICRO_BATCHING = os.getenv("TRANSUM_MICRO_BATCHING", "0") == "1"
+MICRO_BATCH_MAX_SIZE = 32  # max number of texts per merged batch
+MICRO_BATCH_MAX_WAIT = 0.01  # max seconds a call waits for others to join its batch
+
+# Inference worker processes (1 runs inference in the app process)
+WORKER_POOL_SIZE = int(os.getenv("TRANSUM_WORKERS", "1"))
+
+# Port of the Prometheus metrics endpoint (0 disables it)
+METRICS_PORT = int(os.getenv("TRANSUM_METRICS_PORT", "9464"))
+
+# Logging: size cap of each log file, rotated files kept and max debug records per second and call site
+LOG_MAX_BYTES = 10 * 2**20
+LOG_BACKUP_COUNT = 5
+LOG_DEBUG_RATE = float(os.getenv("TRANSUM_LOG_DEBUG_RATE", "5"))
+
+# Cold start time budget, from the process start to serving requests, in seconds
+STARTUP_BUDGET = float(os.getenv("TRANSUM_STARTUP_BUDGET", "120"))
+
+# Headless JSON API: port (0 disables it alongside the interface), max requests processed at once,
+# and number of feeds fetched and processed together per batch
+API_PORT = int(os.getenv("TRANSUM_API_PORT", "8000"))
+API_MAX_CONCURRENT_REQUESTS = 4
+FEEDS_BATCH_SIZE = 32
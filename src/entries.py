@@ -0,0 +1,61 @@
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+
+@dataclass(slots=True)
+class ProcessedEntry:
+    """A processed feed entry, holding only what is shown of it rather than the raw
+    feedparser entry (full HTML content, enclosures, tags), so that the entries kept in
+    the interface's state, stored and sent between processes stay small
+    """
+
+    title: str
+    summary: str
+    author: str = ""
+    link: str = ""
+    language: str = ""
+    source_id: str = ""
+
+    def to_dict(self) -> Dict:
+        """Convert the entry to a dictionary, e.g. for JSON serialization
+
+        Returns:
+            Dict: the entry's fields
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProcessedEntry":
+        """Build an entry from its dictionary, as stored before or returned by to_dict
+
+        Args:
+            data (Dict): the entry's fields
+
+        Returns:
+            ProcessedEntry: the entry
+        """
+        return cls(
+            title=data.get("title", ""),
+            # Entries stored by earlier versions hold their summary as "content"
+            summary=data.get("summary", data.get("content", "")),
+            author=data.get("author", ""),
+            link=data.get("link", ""),
+            language=data.get("language", ""),
+            source_id=data.get("source_id", ""),
+        )
+
+    def to_markdown(self) -> str:
+        """Render the entry in Markdown, only when it is viewed
+
+        Returns:
+            str: the rendered entry
+        """
+        parts = [
+            f"### {self.title or '---'}\n\n",
+            f"**Author:** {self.author or '-'}\n\n",
+            f"{self.summary}\n\n",
+        ]
+        if self.link:
+            parts.append(f"[Read more]({self.link})\n\n")
+        parts.append("---\n\n")
+        return "".join(parts)
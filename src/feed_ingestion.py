@@ -0,0 +1,229 @@
+import asyncio
+import logging
+
+from collections import defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+import feedparser
+import httpx
+
+from config import (
+    FETCH_MAX_CONNECTIONS,
+    FETCH_PER_HOST_LIMIT,
+    FETCH_TIMEOUT,
+    PARSE_WORKERS,
+    STREAM_CHUNK_SIZE,
+)
+from metrics import span
+
+
+logger = logging.getLogger("src.feed_ingestion")
+
+
+def _parse_feed(content: bytes, rss_url: str, entries_limit: int = None) -> List[Dict]:
+    """Parse the fetched content of a feed (run in the parsing thread pool)
+
+    Args:
+        content (bytes): the raw feed document
+        rss_url (str): the feed url, used for resolving relative links
+        entries_limit (int, optional): the number of feed-entries to keep. Defaults to None (keep all).
+
+    Returns:
+        List[Dict]: the raw feed entries
+    """
+    feed = feedparser.parse(content, response_headers={"content-location": rss_url})
+    return feed.entries[:entries_limit]
+
+
+def _read_and_parse_feed(rss_url: str, entries_limit: int = None) -> List[Dict]:
+    """Read and parse a feed that is not fetched over HTTP, e.g. a local file
+    (run in the parsing thread pool)
+
+    Args:
+        rss_url (str): the feed path or url
+        entries_limit (int, optional): the number of feed-entries to keep. Defaults to None (keep all).
+
+    Raises:
+        RuntimeError: error in case the feed could not be read
+
+    Returns:
+        List[Dict]: the raw feed entries
+    """
+    feed = feedparser.parse(rss_url)
+    if feed.get("bozo") and not feed.entries:
+        raise RuntimeError(
+            f"Failed to read feed {rss_url}: {feed.get('bozo_exception')}"
+        )
+    return feed.entries[:entries_limit]
+
+
+async def _fetch_and_parse(
+    client: httpx.AsyncClient,
+    host_limits: Dict[str, asyncio.Semaphore],
+    parse_pool: Executor,
+    rss_url: str,
+    entries_limit: int = None,
+) -> List[Dict]:
+    """Fetch a feed, respecting the concurrency limit of its host, and parse it in the thread pool
+
+    Args:
+        client (httpx.AsyncClient): the pooled HTTP client
+        host_limits (Dict[str, asyncio.Semaphore]): the concurrency limits, per host
+        parse_pool (Executor): the parsing thread pool
+        rss_url (str): the feed url
+        entries_limit (int, optional): the number of feed-entries to keep. Defaults to None (keep all).
+
+    Returns:
+        List[Dict]: the raw feed entries
+    """
+    loop = asyncio.get_running_loop()
+
+    # Local files (and other non-HTTP urls) are read by feedparser itself
+    if urlsplit(rss_url).scheme not in ("http", "https"):
+        with span("parse"):
+            return await loop.run_in_executor(
+                parse_pool, _read_and_parse_feed, rss_url, entries_limit
+            )
+
+    async with host_limits[urlsplit(rss_url).netloc]:
+        with span("fetch"):
+            response = await client.get(rss_url)
+        response.raise_for_status()
+
+    with span("parse"):
+        return await loop.run_in_executor(
+            parse_pool, _parse_feed, response.content, rss_url, entries_limit
+        )
+
+
+def _process_entries(
+    task_manager, entries: List[Dict], src_lang: str, tgt_lang: str
+) -> List[Dict]:
+    """Process the entries in chunks, spread across the inference worker processes
+    when the task manager has any, or through its staged pipeline otherwise
+    """
+    return [
+        processed_entry
+        for processed_entries in task_manager.iter_process_entries(
+            (
+                entries[start : start + STREAM_CHUNK_SIZE]
+                for start in range(0, len(entries), STREAM_CHUNK_SIZE)
+            ),
+            src_lang,
+            tgt_lang,
+        )
+        for processed_entry in processed_entries
+    ]
+
+
+async def ingest_feeds(
+    task_manager,
+    feeds: List[Tuple[str, str, str]],
+    entries_limit: int = None,
+) -> List[Dict]:
+    """Fetch many feeds concurrently and process all their entries in a single batched
+    inference stage. Feeds fetched while the models are busy are batched together
+    in the next inference round, so that fetch latency overlaps with model compute.
+
+    Args:
+        task_manager (TaskManager): the task manager processing the entries
+        feeds (List[Tuple[str, str, str]]): the (feed url, source language, target language) of each feed
+        entries_limit (int, optional): the number of entries to be processed per feed. Defaults to None (process all).
+
+    Returns:
+        List[Dict]: per input feed (in input order), a dictionary with the feed url, the languages,
+        the processed entries and the error message in case the feed could not be processed
+    """
+    results = [
+        {
+            "rss_url": str(rss_url),
+            "src_lang": src_lang,
+            "tgt_lang": tgt_lang,
+            "entries": [],
+            "error": None,
+        }
+        for rss_url, src_lang, tgt_lang in feeds
+    ]
+
+    host_limits = defaultdict(lambda: asyncio.Semaphore(FETCH_PER_HOST_LIMIT))
+    parsed_feeds = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+
+    # Each feed url is fetched and parsed once, for all of its language pairs
+    feeds_by_url = defaultdict(list)
+    for feed_idx, result in enumerate(results):
+        feeds_by_url[result["rss_url"]].append(feed_idx)
+
+    async def fetch(rss_url: str) -> None:
+        try:
+            entries = await _fetch_and_parse(
+                client, host_limits, parse_pool, rss_url, entries_limit
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch feed {rss_url}: {e}")
+            for feed_idx in feeds_by_url[rss_url]:
+                results[feed_idx]["error"] = str(e)
+        else:
+            for feed_idx in feeds_by_url[rss_url]:
+                await parsed_feeds.put((feed_idx, entries))
+
+    async def infer() -> None:
+        done = False
+        while not done:
+            # Wait for one parsed feed, then take all others already parsed
+            parsed = [await parsed_feeds.get()]
+            while not parsed_feeds.empty():
+                parsed.append(parsed_feeds.get_nowait())
+            if None in parsed:
+                done = True
+                parsed.remove(None)
+
+            # One batched model call per language pair
+            by_langs = defaultdict(list)
+            for feed_idx, entries in parsed:
+                by_langs[
+                    (results[feed_idx]["src_lang"], results[feed_idx]["tgt_lang"])
+                ].append((feed_idx, entries))
+
+            for (src_lang, tgt_lang), lang_feeds in by_langs.items():
+                all_entries = [entry for _, entries in lang_feeds for entry in entries]
+                try:
+                    processed_entries = await loop.run_in_executor(
+                        inference_pool,
+                        _process_entries,
+                        task_manager,
+                        all_entries,
+                        src_lang,
+                        tgt_lang,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to process feed entries: {e}")
+                    for feed_idx, _ in lang_feeds:
+                        results[feed_idx]["error"] = str(e)
+                    continue
+
+                start = 0
+                for feed_idx, entries in lang_feeds:
+                    results[feed_idx]["entries"] = processed_entries[
+                        start : start + len(entries)
+                    ]
+                    start += len(entries)
+
+    limits = httpx.Limits(max_connections=FETCH_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(
+        timeout=FETCH_TIMEOUT, limits=limits, follow_redirects=True
+    ) as client:
+        # Parsing the fetched bytes is cheap, threads avoid forking the (large) app process
+        with ThreadPoolExecutor(PARSE_WORKERS) as parse_pool, ThreadPoolExecutor(
+            1
+        ) as inference_pool:
+            inference = asyncio.create_task(infer())
+            await asyncio.gather(*(fetch(rss_url) for rss_url in feeds_by_url))
+
+            # Signal the inference stage that no more feeds are coming
+            await parsed_feeds.put(None)
+            await inference
+
+    return results
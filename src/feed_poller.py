@@ -0,0 +1,161 @@
+import heapq
+import json
+import logging
+import random
+import threading
+
+from time import monotonic
+from typing import Dict, List
+
+from job_queue import BACKGROUND
+
+
+logger = logging.getLogger("src.feed_poller")
+
+
+def load_subscriptions(path: str) -> List[Dict]:
+    """Load the feed subscriptions from a JSON file, e.g.
+    [{"rss_url": "https://...", "src_lang": "el", "tgt_lang": "en", "interval": 600}]
+
+    Args:
+        path (str): the JSON file of the subscriptions
+
+    Returns:
+        List[Dict]: the subscriptions, an empty list in case the file does not exist
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+class FeedPoller:
+    """Background service refreshing a set of subscribed feeds periodically, through the
+    job queue (at background priority), so that their processed entries are always available
+    in the task manager's feed state store
+    """
+
+    def __init__(
+        self,
+        job_queue,
+        subscriptions: List[Dict],
+        default_interval: float = 900,
+        jitter: float = 0.1,
+        inference_budget: float = 30,
+        budget_window: float = 60,
+    ):
+        """
+        Args:
+            job_queue (JobQueue): the job queue processing the feeds, through a task manager with a feed state store
+            subscriptions (List[Dict]): the rss_url, src_lang, tgt_lang and optional interval (seconds)
+                and entries_limit of each subscribed feed
+            default_interval (float, optional): the polling interval of subscriptions without one. Defaults to 900.
+            jitter (float, optional): the random fraction each interval is stretched or shrunk by. Defaults to 0.1.
+            inference_budget (float, optional): the max seconds spent processing feeds per budget window. Defaults to 30.
+            budget_window (float, optional): the seconds of a budget window. Defaults to 60.
+        """
+        self.job_queue = job_queue
+        self.subscriptions = subscriptions
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.inference_budget = inference_budget
+        self.budget_window = budget_window
+
+        self._subscribed = {
+            self._key(sub["rss_url"], sub["src_lang"], sub["tgt_lang"])
+            for sub in subscriptions
+        }
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Inference seconds spent in the current budget window
+        self._window_start = monotonic()
+        self._window_spent = 0.0
+
+    @staticmethod
+    def _key(rss_url: str, src_lang: str, tgt_lang: str):
+        return str(rss_url), src_lang, tgt_lang
+
+    def is_subscribed(self, rss_url: str, src_lang: str, tgt_lang: str) -> bool:
+        """Check whether a feed is kept fresh by the poller
+
+        Args:
+            rss_url (str): the feed url
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language of the processed entries
+
+        Returns:
+            bool: True if the feed is subscribed, False otherwise
+        """
+        return self._key(rss_url, src_lang, tgt_lang) in self._subscribed
+
+    def _next_delay(self, subscription: Dict) -> float:
+        # Jitter spreads the refreshes of feeds sharing the same interval
+        interval = subscription.get("interval", self.default_interval)
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _wait_for_budget(self) -> None:
+        """Block until the current budget window has inference time left"""
+        while not self._stop.is_set():
+            now = monotonic()
+            if now - self._window_start >= self.budget_window:
+                self._window_start, self._window_spent = now, 0.0
+            if self._window_spent < self.inference_budget:
+                return
+            self._stop.wait(self._window_start + self.budget_window - now)
+
+    def _refresh(self, subscription: Dict) -> None:
+        ts = monotonic()
+        try:
+            self.job_queue.submit(
+                subscription["rss_url"],
+                subscription["src_lang"],
+                subscription["tgt_lang"],
+                subscription.get("entries_limit"),
+                priority=BACKGROUND,
+            ).result()
+        except Exception as e:
+            logger.error(f"Failed to refresh feed {subscription['rss_url']}: {e}")
+        finally:
+            self._window_spent += monotonic() - ts
+
+    def _run(self) -> None:
+        # Subscriptions are first refreshed soon after start, spread over a fraction of their interval
+        schedule = [
+            (monotonic() + random.uniform(0, self.jitter) * self._next_delay(sub), i)
+            for i, sub in enumerate(self.subscriptions)
+        ]
+        heapq.heapify(schedule)
+
+        while schedule and not self._stop.is_set():
+            due, i = schedule[0]
+            if self._stop.wait(max(0.0, due - monotonic())):
+                break
+
+            heapq.heappop(schedule)
+            self._wait_for_budget()
+            if self._stop.is_set():
+                break
+
+            self._refresh(self.subscriptions[i])
+            heapq.heappush(
+                schedule, (monotonic() + self._next_delay(self.subscriptions[i]), i)
+            )
+
+    def start(self) -> None:
+        """Start polling the subscribed feeds in a background thread"""
+        if self._thread is None and self.subscriptions:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="feed-poller", daemon=True
+            )
+            self._thread.start()
+            logger.info(f"Polling {len(self.subscriptions)} subscribed feeds")
+
+    def stop(self) -> None:
+        """Stop polling, waiting for the refresh in progress to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
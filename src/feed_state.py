@@ -0,0 +1,171 @@
+import json
+import sqlite3
+import threading
+
+from typing import Dict, List, Optional
+
+from entries import ProcessedEntry
+
+
+class FeedStateStore:
+    """SQLite store remembering, per feed and language pair, the feed's ETag/Last-Modified
+    validators and the processed results of the entries already seen
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): the SQLite database file of the store
+        """
+        self.db_path = db_path
+
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _feed_key(rss_url: str, src_lang: str, tgt_lang: str) -> str:
+        # Processed results depend on the language pair, not only on the feed
+        return json.dumps([str(rss_url), src_lang, tgt_lang])
+
+    def _connection(self) -> sqlite3.Connection:
+        # The database is opened on first use, not when the store is created
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS feeds "
+                "(feed_key TEXT PRIMARY KEY, etag TEXT, modified TEXT, entry_ids TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(feed_key TEXT NOT NULL, entry_id TEXT NOT NULL, result TEXT NOT NULL, "
+                "PRIMARY KEY (feed_key, entry_id))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_feed(self, rss_url: str, src_lang: str, tgt_lang: str) -> Optional[Dict]:
+        """Get the stored state of a feed
+
+        Args:
+            rss_url (str): the feed url
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language of the processed entries
+
+        Returns:
+            Optional[Dict]: the etag, modified validators and the ids of the feed entries
+            (in feed order), None in case the feed has not been processed before
+        """
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT etag, modified, entry_ids FROM feeds WHERE feed_key = ?",
+                    (self._feed_key(rss_url, src_lang, tgt_lang),),
+                )
+                .fetchone()
+            )
+
+        if row is None:
+            return None
+
+        etag, modified, entry_ids = row
+        return {"etag": etag, "modified": modified, "entry_ids": json.loads(entry_ids)}
+
+    def save_feed(
+        self,
+        rss_url: str,
+        src_lang: str,
+        tgt_lang: str,
+        etag: Optional[str],
+        modified: Optional[str],
+        entry_ids: List[str],
+    ) -> None:
+        """Save the state of a feed, dropping the stored results of entries no longer in it
+
+        Args:
+            rss_url (str): the feed url
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language of the processed entries
+            etag (Optional[str]): the ETag of the feed response
+            modified (Optional[str]): the Last-Modified of the feed response
+            entry_ids (List[str]): the ids of the feed entries, in feed order
+        """
+        feed_key = self._feed_key(rss_url, src_lang, tgt_lang)
+        current_ids = set(entry_ids)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO feeds (feed_key, etag, modified, entry_ids) "
+                "VALUES (?, ?, ?, ?)",
+                (feed_key, etag, modified, json.dumps(entry_ids)),
+            )
+            stale_ids = [
+                entry_id
+                for (entry_id,) in conn.execute(
+                    "SELECT entry_id FROM entries WHERE feed_key = ?", (feed_key,)
+                )
+                if entry_id not in current_ids
+            ]
+            conn.executemany(
+                "DELETE FROM entries WHERE feed_key = ? AND entry_id = ?",
+                [(feed_key, entry_id) for entry_id in stale_ids],
+            )
+            conn.commit()
+
+    def get_entries(
+        self, rss_url: str, src_lang: str, tgt_lang: str, entry_ids: List[str]
+    ) -> Dict[str, ProcessedEntry]:
+        """Get the stored results of the given feed entries
+
+        Args:
+            rss_url (str): the feed url
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language of the processed entries
+            entry_ids (List[str]): the ids of the entries
+
+        Returns:
+            Dict[str, ProcessedEntry]: the processed entries found, keyed by entry id
+        """
+        feed_key = self._feed_key(rss_url, src_lang, tgt_lang)
+        results = {}
+        with self._lock:
+            conn = self._connection()
+            for entry_id in entry_ids:
+                row = conn.execute(
+                    "SELECT result FROM entries WHERE feed_key = ? AND entry_id = ?",
+                    (feed_key, entry_id),
+                ).fetchone()
+                if row is not None:
+                    results[entry_id] = ProcessedEntry.from_dict(json.loads(row[0]))
+        return results
+
+    def save_entries(
+        self,
+        rss_url: str,
+        src_lang: str,
+        tgt_lang: str,
+        entries: Dict[str, ProcessedEntry],
+    ) -> None:
+        """Save the results of processed feed entries
+
+        Args:
+            rss_url (str): the feed url
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language of the processed entries
+            entries (Dict[str, ProcessedEntry]): the processed entries, keyed by entry id
+        """
+        feed_key = self._feed_key(rss_url, src_lang, tgt_lang)
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (feed_key, entry_id, result) VALUES (?, ?, ?)",
+                [
+                    (
+                        feed_key,
+                        entry_id,
+                        json.dumps(entry.to_dict(), ensure_ascii=False),
+                    )
+                    for entry_id, entry in entries.items()
+                ],
+            )
+            conn.commit()
@@ -0,0 +1,121 @@
+from typing import Dict
+
+from config import (
+    SUMMARIZATION_INTERACTIVE_NUM_BEAMS,
+    SUMMARIZATION_NUM_BEAMS,
+    SUMMARIZATION_SHORT_INPUT_TOKENS,
+    SUMMARIZATION_SHORT_NUM_BEAMS,
+    TRANSLATION_LENGTH_MARGIN,
+    TRANSLATION_LENGTH_RATIO,
+)
+
+
+class GenerationPolicy:
+    """Decides how much generation effort each input gets, from its length in tokens
+    and whether a user is waiting for it.
+
+    The trade-off: beam search finds slightly more fluent summaries than greedy search,
+    at roughly the number of beams times the decoding work, which matters least on short
+    inputs (their summaries are a handful of tokens) and most on interactive requests.
+    Texts already shorter than the summary would be are returned as they are, costing
+    no generation at all, and translations are capped relative to their source length
+    (within the model's max length),
+    so that a degenerate, repeating output stops early rather than at the model's max length.
+    """
+
+    def __init__(
+        self,
+        num_beams: int = SUMMARIZATION_NUM_BEAMS,
+        short_input_tokens: int = SUMMARIZATION_SHORT_INPUT_TOKENS,
+        short_num_beams: int = SUMMARIZATION_SHORT_NUM_BEAMS,
+        interactive_num_beams: int = SUMMARIZATION_INTERACTIVE_NUM_BEAMS,
+        translation_length_ratio: float = TRANSLATION_LENGTH_RATIO,
+        translation_length_margin: int = TRANSLATION_LENGTH_MARGIN,
+    ):
+        """
+        Args:
+            num_beams (int, optional): the beams of the summaries. Defaults to SUMMARIZATION_NUM_BEAMS.
+            short_input_tokens (int, optional): the max tokens of a short input. Defaults to SUMMARIZATION_SHORT_INPUT_TOKENS.
+            short_num_beams (int, optional): the beams of the short inputs' summaries. Defaults to SUMMARIZATION_SHORT_NUM_BEAMS.
+            interactive_num_beams (int, optional): the max beams of the interactive requests' summaries.
+                Defaults to SUMMARIZATION_INTERACTIVE_NUM_BEAMS.
+            translation_length_ratio (float, optional): the max translation tokens per source token.
+                Defaults to TRANSLATION_LENGTH_RATIO.
+            translation_length_margin (int, optional): the translation tokens allowed on top of the ratio.
+                Defaults to TRANSLATION_LENGTH_MARGIN.
+        """
+        self.num_beams = num_beams
+        self.short_input_tokens = short_input_tokens
+        self.short_num_beams = short_num_beams
+        self.interactive_num_beams = interactive_num_beams
+        self.translation_length_ratio = translation_length_ratio
+        self.translation_length_margin = translation_length_margin
+
+    def skip_summary(self, input_tokens: int, max_length: int) -> bool:
+        """Check whether a text is already within the summary's budget, and kept as it is
+
+        Args:
+            input_tokens (int): the length, in tokens, of the text to summarize
+            max_length (int): the max_length downlimit of the summarized text
+
+        Returns:
+            bool: True if the text needs no summarization, False otherwise
+        """
+        return input_tokens <= max_length
+
+    def summary_num_beams(self, input_tokens: int, interactive: bool = False) -> int:
+        """Get the number of beams of a summary (1 for greedy search)
+
+        Args:
+            input_tokens (int): the length, in tokens, of the text to summarize
+            interactive (bool, optional): whether a user is waiting for the summary. Defaults to False.
+
+        Returns:
+            int: the number of beams
+        """
+        num_beams = (
+            self.short_num_beams
+            if input_tokens <= self.short_input_tokens
+            else self.num_beams
+        )
+        if interactive:
+            num_beams = min(num_beams, self.interactive_num_beams)
+        return num_beams
+
+    def translation_max_new_tokens(
+        self, input_tokens: int, max_length: int = None
+    ) -> int:
+        """Get the max number of tokens of a translation
+
+        Args:
+            input_tokens (int): the length, in tokens, of the text to translate
+            max_length (int, optional): the max length of the translation model's outputs,
+                never exceeded. Defaults to None (no limit).
+
+        Returns:
+            int: the max new tokens
+        """
+        max_new_tokens = (
+            round(input_tokens * self.translation_length_ratio)
+            + self.translation_length_margin
+        )
+        if max_length is not None:
+            max_new_tokens = min(max_new_tokens, max_length)
+        return max_new_tokens
+
+    def params(self, interactive: bool = False) -> Dict:
+        """Get the parameters the policy generates with, e.g. for the result cache keys,
+        with the beams actually used by the requests of the given kind
+
+        Args:
+            interactive (bool, optional): whether a user is waiting for the results. Defaults to False.
+
+        Returns:
+            Dict: the parameters
+        """
+        params = dict(vars(self))
+        interactive_num_beams = params.pop("interactive_num_beams")
+        if interactive:
+            params["num_beams"] = min(self.num_beams, interactive_num_beams)
+            params["short_num_beams"] = min(self.short_num_beams, interactive_num_beams)
+        return params
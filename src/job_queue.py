@@ -0,0 +1,256 @@
+import itertools
+import logging
+import queue
+import threading
+
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from metrics import MetricFamily
+
+
+logger = logging.getLogger("src.job_queue")
+
+
+# Job priorities, lower runs first
+INTERACTIVE = 0
+BATCH = 1
+BACKGROUND = 2
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is rejected because too many jobs are already waiting"""
+
+
+class Job:
+    """A feed processing job, shared by all the requests coalesced into it,
+    each of them able to stream the processed entries as they are produced
+    """
+
+    def __init__(
+        self, key: Tuple, priority: int, run: Callable[[bool], Iterable[List[Dict]]]
+    ):
+        self.key = key
+        self.priority = priority
+        self.started = False
+
+        # Produces the chunks of the job, given whether it runs as an interactive one
+        self._run = run
+
+        self._chunks: List[List[Dict]] = []
+        self._done = False
+        self._error = None
+        self._cond = threading.Condition()
+
+    def _add_chunk(self, chunk: List[Dict]) -> None:
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def _finish(self, error: Exception = None) -> None:
+        with self._cond:
+            self._done, self._error = True, error
+            self._cond.notify_all()
+
+    def iter_chunks(self) -> Iterator[List[Dict]]:
+        """Stream the processed entries of the job, from its first chunk on
+
+        Raises:
+            Exception: the error the job failed with
+
+        Yields:
+            List[Dict]: the processed entries of the next chunk of the feed
+        """
+        position = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._done or position < len(self._chunks))
+                chunks = self._chunks[position:]
+                done, error = self._done, self._error
+
+            for chunk in chunks:
+                yield chunk
+            position += len(chunks)
+
+            if done and position == len(self._chunks):
+                if error is not None:
+                    raise error
+                return
+
+    def result(self) -> List[Dict]:
+        """Wait for the job to finish
+
+        Returns:
+            List[Dict]: all the processed entries of the job
+        """
+        return [entry for chunk in self.iter_chunks() for entry in chunk]
+
+
+class JobQueue:
+    """Bounded priority queue of feed processing jobs in front of the task manager.
+    Identical in-flight requests are coalesced into a single job, interactive jobs run
+    before batch ones (the JSON API's) and these before background ones, and new jobs
+    are rejected once too many are waiting.
+    """
+
+    def __init__(self, task_manager, max_depth: int = 32, workers: int = 1):
+        """
+        Args:
+            task_manager (TaskManager): the task manager running the jobs
+            max_depth (int, optional): the max number of jobs waiting to run. Defaults to 32.
+            workers (int, optional): the number of jobs running concurrently. Defaults to 1.
+        """
+        self.task_manager = task_manager
+        self.max_depth = max_depth
+        self.workers = workers
+
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._in_flight: Dict[Tuple, Job] = {}
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(
+        self,
+        rss_url: str,
+        src_lang: str,
+        tgt_lang: str,
+        entries_limit: int = None,
+        priority: int = INTERACTIVE,
+    ) -> Job:
+        """Submit a feed processing job, or join the identical one already in flight
+
+        Args:
+            rss_url (str): the feed url to parse
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language to which the content will be translated
+            entries_limit (int, optional): the number of feed-entries to be processed. Defaults to None (process all).
+            priority (int, optional): INTERACTIVE, BATCH or BACKGROUND. Defaults to INTERACTIVE.
+
+        Raises:
+            QueueFullError: error in case too many jobs are already waiting
+
+        Returns:
+            Job: the job processing the feed
+        """
+        key = (str(rss_url), src_lang, tgt_lang, entries_limit)
+        return self._submit(
+            key,
+            priority,
+            lambda interactive: self.task_manager.iter_parse_and_process_feed(
+                *key, interactive=interactive
+            ),
+        )
+
+    def submit_batch(
+        self,
+        feeds: List[Tuple[str, str, str]],
+        entries_limit: int = None,
+        priority: int = BATCH,
+    ) -> Job:
+        """Submit a job processing many feeds together (each feed url fetched once),
+        or join the identical one already in flight
+
+        Args:
+            feeds (List[Tuple[str, str, str]]): the (feed url, source language, target language) of each feed
+            entries_limit (int, optional): the number of entries to be processed per feed. Defaults to None (process all).
+            priority (int, optional): INTERACTIVE, BATCH or BACKGROUND. Defaults to BATCH.
+
+        Raises:
+            QueueFullError: error in case too many jobs are already waiting
+
+        Returns:
+            Job: the job, whose result is the result dictionary of each feed (in input order)
+        """
+        feeds = [
+            (str(rss_url), src_lang, tgt_lang) for rss_url, src_lang, tgt_lang in feeds
+        ]
+        key = ("batch", tuple(feeds), entries_limit)
+        return self._submit(
+            key,
+            priority,
+            lambda interactive: [
+                self.task_manager.parse_and_process_feeds(feeds, entries_limit)
+            ],
+        )
+
+    def _submit(
+        self, key: Tuple, priority: int, run: Callable[[bool], Iterable[List[Dict]]]
+    ) -> Job:
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                # A more urgent request moves the waiting job ahead
+                if priority < job.priority and not job.started:
+                    job.priority = priority
+                    self._queue.put((priority, next(self._seq), job))
+                return job
+
+            if self._queued >= self.max_depth:
+                raise QueueFullError("Too many pending requests, try again later.")
+
+            job = Job(key, priority, run)
+            self._in_flight[key] = job
+            self._queued += 1
+            self._queue.put((priority, next(self._seq), job))
+            return job
+
+    def stats(self) -> Dict:
+        """Get the current load of the queue
+
+        Returns:
+            Dict: the number of jobs waiting and in flight (waiting or running)
+        """
+        with self._lock:
+            return {"queued": self._queued, "in_flight": len(self._in_flight)}
+
+    def collect_metrics(self) -> List[MetricFamily]:
+        """Collect the current load of the queue, in the format of the metrics registry's collectors
+
+        Returns:
+            List[MetricFamily]: the metric families
+        """
+        stats = self.stats()
+        return [
+            (
+                "transum_job_queue_jobs",
+                "gauge",
+                "Feed processing jobs waiting, and in flight (waiting or running)",
+                [
+                    ("transum_job_queue_jobs", {"state": state}, count)
+                    for state, count in stats.items()
+                ],
+            )
+        ]
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+
+            # Skip the stale entries of jobs moved ahead
+            with self._lock:
+                if job.started:
+                    continue
+                job.started = True
+                self._queued -= 1
+
+            try:
+                for chunk in job._run(job.priority == INTERACTIVE):
+                    job._add_chunk(chunk)
+            except Exception as e:
+                logger.error(f"Job {job.key} failed: {e}")
+                job._finish(e)
+            else:
+                job._finish()
+            finally:
+                with self._lock:
+                    del self._in_flight[job.key]
+
+    def start(self) -> None:
+        """Start the workers running the jobs"""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
@@ -0,0 +1,228 @@
+import json
+import logging
+import threading
+
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from config import API_MAX_CONCURRENT_REQUESTS, FEEDS_BATCH_SIZE
+from entries import ProcessedEntry
+from job_queue import BATCH
+
+
+logger = logging.getLogger("src.json_api")
+
+
+def parse_feed_requests(records: Iterable[Dict]) -> List[Tuple[str, str, str]]:
+    """Expand feed requests into the (feed url, source language, target language) to process, e.g.
+    {"rss_url": "https://...", "src_lang": "el", "tgt_lang": "en"} or, for many language pairs,
+    {"rss_url": "https://...", "src_lang": "el", "tgt_lang": ["en", "fr"]}
+
+    Args:
+        records (Iterable[Dict]): the feed requests
+
+    Raises:
+        ValueError: error in case of a request missing its url or languages
+
+    Returns:
+        List[Tuple[str, str, str]]: the feeds to process, in request order
+    """
+    feeds = []
+    for record in records:
+        try:
+            rss_url, src_lang, tgt_langs = (
+                record["rss_url"],
+                record["src_lang"],
+                record["tgt_lang"],
+            )
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"Invalid feed request {record!r}, expected rss_url, src_lang and tgt_lang."
+            )
+
+        if isinstance(tgt_langs, str):
+            tgt_langs = [tgt_langs]
+        feeds.extend((rss_url, src_lang, tgt_lang) for tgt_lang in tgt_langs)
+    return feeds
+
+
+def iter_feed_results(
+    process_feeds: Callable[[List[Tuple[str, str, str]], int], List[Dict]],
+    feeds: List[Tuple[str, str, str]],
+    entries_limit: int = None,
+    batch_size: int = FEEDS_BATCH_SIZE,
+) -> Iterator[Dict]:
+    """Process many feeds, in batches fetched concurrently and processed together,
+    yielding the result of each feed as soon as its batch is done
+
+    Args:
+        process_feeds (Callable[[List[Tuple[str, str, str]], int], List[Dict]]): processes a batch of feeds
+            with an entries limit, e.g. the task manager's parse_and_process_feeds
+        feeds (List[Tuple[str, str, str]]): the (feed url, source language, target language) of each feed
+        entries_limit (int, optional): the number of entries to be processed per feed. Defaults to None (process all).
+        batch_size (int, optional): the number of feeds per batch, the language pairs of a feed url
+            are kept in the same batch (the feed is fetched once for all of them). Defaults to FEEDS_BATCH_SIZE.
+
+    Yields:
+        Dict: per feed (in input order), the feed url, the languages, the processed entries
+        and the error message in case the feed could not be processed
+    """
+    batch = []
+    for feed in feeds:
+        if len(batch) >= batch_size and feed[0] != batch[-1][0]:
+            yield from process_feeds(batch, entries_limit)
+            batch = []
+        batch.append(feed)
+    if batch:
+        yield from process_feeds(batch, entries_limit)
+
+
+def process_feeds_in_queue(
+    job_queue, feeds: List[Tuple[str, str, str]], entries_limit: int = None
+) -> List[Dict]:
+    """Process a batch of feeds as a job of the job queue, after the interface's
+    requests and before the background refreshes of the subscribed feeds
+
+    Args:
+        job_queue (JobQueue): the job queue in front of the task manager
+        feeds (List[Tuple[str, str, str]]): the (feed url, source language, target language) of each feed
+        entries_limit (int, optional): the number of entries to be processed per feed. Defaults to None (process all).
+
+    Returns:
+        List[Dict]: per input feed (in input order), the result dictionary, with the error message
+        of the whole batch in case it could not be queued or processed
+    """
+    try:
+        return job_queue.submit_batch(feeds, entries_limit, priority=BATCH).result()
+    except Exception as e:
+        logger.error(f"Failed to process feeds batch: {e}")
+        return [
+            {
+                "rss_url": str(rss_url),
+                "src_lang": src_lang,
+                "tgt_lang": tgt_lang,
+                "entries": [],
+                "error": str(e),
+            }
+            for rss_url, src_lang, tgt_lang in feeds
+        ]
+
+
+def _to_json(value):
+    if isinstance(value, ProcessedEntry):
+        return value.to_dict()
+    return str(value)
+
+
+def to_ndjson(record: Dict) -> str:
+    """Serialize a record as a line of newline-delimited JSON"""
+    return json.dumps(record, ensure_ascii=False, default=_to_json) + "\n"
+
+
+class _JsonApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/ready":
+            self.send_error(404)
+            return
+        if self.server.ready():
+            self._send_json(200, {"ready": True})
+        else:
+            self._send_json(503, {"ready": False})
+
+    def do_POST(self):
+        if self.path.split("?")[0] != "/process":
+            self.send_error(404)
+            return
+        if not self.server.ready():
+            self._send_json(
+                503, {"error": "The models are still loading, try again later."}
+            )
+            return
+
+        try:
+            body = json.loads(
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            )
+            feeds = parse_feed_requests(body["feeds"])
+            entries_limit = body.get("entries_limit")
+            if entries_limit is not None and (
+                not isinstance(entries_limit, int)
+                or isinstance(entries_limit, bool)
+                or entries_limit < 0
+            ):
+                raise ValueError(
+                    f"entries_limit must be a non-negative integer, got {entries_limit!r}"
+                )
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        # Admission control, requests are rejected rather than queued without bound
+        if not self.server.slots.acquire(blocking=False):
+            self._send_json(
+                429, {"error": "Too many concurrent requests, try again later."}
+            )
+            return
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+            self.end_headers()
+            for result in iter_feed_results(
+                partial(process_feeds_in_queue, self.server.get_job_queue()),
+                feeds,
+                entries_limit,
+            ):
+                self.wfile.write(to_ndjson(result).encode("utf-8"))
+                self.wfile.flush()
+        except Exception as e:
+            logger.error(f"Failed to process request: {e}")
+        finally:
+            self.server.slots.release()
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = to_ndjson(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class JsonApiServer(ThreadingHTTPServer):
+    """Headless JSON API over the job queue:
+    POST /process with {"feeds": [feed requests], "entries_limit": 10} streams one NDJSON line
+    per feed and language pair as soon as it is processed, GET /ready reports readiness
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int,
+        get_job_queue: Callable,
+        ready: Callable[[], bool] = None,
+        max_concurrent_requests: int = API_MAX_CONCURRENT_REQUESTS,
+    ):
+        """
+        Args:
+            port (int): the port to listen on, on all interfaces
+            get_job_queue (Callable): returns the long-lived job queue the feeds are processed through
+            ready (Callable[[], bool], optional): checks whether the app is ready. Defaults to None (always ready).
+            max_concurrent_requests (int, optional): the max requests processed at once, others are
+                rejected. Defaults to API_MAX_CONCURRENT_REQUESTS.
+        """
+        super().__init__(("", port), _JsonApiHandler)
+        self.get_job_queue = get_job_queue
+        self.ready = ready or (lambda: True)
+        self.slots = threading.BoundedSemaphore(max_concurrent_requests)
+
+    def start(self) -> None:
+        """Serve the requests from a background thread"""
+        threading.Thread(
+            target=self.serve_forever, name="json-api", daemon=True
+        ).start()
+        logger.info(f"Serving the JSON API on port {self.server_address[1]}")
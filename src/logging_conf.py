@@ -1,3 +1,17 @@
+import atexit
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import threading
+
+from time import monotonic
+from typing import List, Tuple
+
+from config import LOG_BACKUP_COUNT, LOG_DEBUG_RATE, LOG_MAX_BYTES
+
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -19,20 +33,29 @@ LOGGING_CONFIG = {
             "level": "INFO",
         },
         "file_info": {
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.RotatingFileHandler",
             "filename": "info.log",
+            "maxBytes": LOG_MAX_BYTES,
+            "backupCount": LOG_BACKUP_COUNT,
+            "encoding": "utf-8",
             "formatter": "standard",
             "level": "INFO",
         },
         "file_debug": {
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.RotatingFileHandler",
             "filename": "debug.log",
+            "maxBytes": LOG_MAX_BYTES,
+            "backupCount": LOG_BACKUP_COUNT,
+            "encoding": "utf-8",
             "formatter": "detailed",
             "level": "DEBUG",
         },
         "file_error": {
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.RotatingFileHandler",
             "filename": "error.log",
+            "maxBytes": LOG_MAX_BYTES,
+            "backupCount": LOG_BACKUP_COUNT,
+            "encoding": "utf-8",
             "formatter": "detailed",
             "level": "ERROR",
         },
@@ -54,3 +77,102 @@ LOGGING_CONFIG = {
         },
     },
 }
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through at most `rate` records per second from each call site, at or below
+    a level (with bursts of up to `burst`), so that per-entry debug messages cannot flood the logs.
+    The number of records dropped is appended to the next one let through.
+    """
+
+    def __init__(self, rate: float, burst: int = None, level: int = logging.DEBUG):
+        """
+        Args:
+            rate (float): the max records per second and call site
+            burst (int, optional): the max records let through at once. Defaults to None (the rate).
+            level (int, optional): the highest level rate-limited. Defaults to logging.DEBUG.
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.level = level
+
+        # Per call site: tokens left, time of the last refill and records dropped since the last one let through
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = monotonic()
+        with self._lock:
+            tokens, last, dropped = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, dropped + 1)
+                return False
+            self._buckets[key] = (tokens - 1, now, 0)
+
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} similar messages dropped)"
+        return True
+
+
+# The queue handler of each configured logger, and the listener writing its records
+_queue_listeners: List[
+    Tuple[logging.handlers.QueueHandler, logging.handlers.QueueListener]
+] = []
+
+
+def _start_listener(queue_handler: logging.handlers.QueueHandler, handlers) -> None:
+    """Start a listener writing the records of the queue handler, on a fresh queue"""
+    queue_handler.queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    _queue_listeners.append((queue_handler, listener))
+
+
+def _restart_listeners_after_fork() -> None:
+    # Forked children do not inherit the listener threads
+    listeners = list(_queue_listeners)
+    _queue_listeners.clear()
+    for queue_handler, listener in listeners:
+        _start_listener(queue_handler, listener.handlers)
+
+
+def _stop_listeners() -> None:
+    # Write out the records still queued
+    for _, listener in _queue_listeners:
+        listener.stop()
+
+
+def setup_logging(config: dict = LOGGING_CONFIG) -> None:
+    """Configure logging so that the request path only puts records on in-memory queues:
+    the handlers of each configured logger (console, rotating files) are moved behind
+    a queue handler, and a listener thread per logger does the actual I/O
+
+    Args:
+        config (dict, optional): the logging config. Defaults to LOGGING_CONFIG.
+    """
+    _stop_listeners()
+    _queue_listeners.clear()
+    logging.config.dictConfig(config)
+
+    for name in config.get("loggers", {}):
+        logger = logging.getLogger(name or None)
+        if not logger.handlers:
+            continue
+
+        # The queue is set when the listener starts
+        queue_handler = logging.handlers.QueueHandler(None)
+        queue_handler.addFilter(RateLimitFilter(LOG_DEBUG_RATE))
+        _start_listener(queue_handler, logger.handlers)
+        logger.handlers = [queue_handler]
+
+
+atexit.register(_stop_listeners)
+os.register_at_fork(after_in_child=_restart_listeners_after_fork)
@@ -0,0 +1,386 @@
+import bisect
+import logging
+import threading
+
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+
+logger = logging.getLogger("src.metrics")
+
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    float("inf"),
+)
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, float("inf"))
+
+# A metric family, as rendered: name, type, help text and (sample name, labels, value) samples
+MetricFamily = Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]
+
+
+class _Metric:
+    """Base of the metrics, keeping one value per combination of label values"""
+
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def drain(self) -> Dict[Tuple[str, ...], object]:
+        """Take the values observed so far, resetting the metric"""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Tuple[str, ...], object]) -> None:
+        """Add the values drained from the same metric of another process"""
+        raise NotImplementedError
+
+    def collect(self) -> MetricFamily:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. of tokens or cache hits"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def merge(self, values: Dict[Tuple[str, ...], float]) -> None:
+        with self._lock:
+            for key, amount in values.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            values = dict(self._values)
+        samples = [
+            (f"{self.name}_total", self._labels(key), value)
+            for key, value in values.items()
+        ]
+        return self.name, self.type, self.documentation, samples
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, e.g. latencies or batch sizes, in fixed buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            counts[min(bisect.bisect_left(self.buckets, value), len(counts) - 1)] += 1
+            self._values[key] = (counts, total + value)
+
+    def merge(self, values: Dict[Tuple[str, ...], Tuple[List[int], float]]) -> None:
+        with self._lock:
+            for key, (counts, total) in values.items():
+                own_counts, own_total = self._values.get(
+                    key, ([0] * len(self.buckets), 0.0)
+                )
+                self._values[key] = (
+                    [own + count for own, count in zip(own_counts, counts)],
+                    own_total + total,
+                )
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the seconds the block takes, whether it succeeds or not"""
+        ts = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - ts, **labels)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            values = {
+                key: (list(counts), total)
+                for key, (counts, total) in self._values.items()
+            }
+        return (
+            self.name,
+            self.type,
+            self.documentation,
+            histogram_samples(
+                self.name,
+                [
+                    (self._labels(key), dict(zip(self.buckets, counts)), total)
+                    for key, (counts, total) in values.items()
+                ],
+            ),
+        )
+
+
+def histogram_samples(
+    name: str, series: Iterable[Tuple[Dict[str, str], Dict[float, int], float]]
+) -> List[Tuple[str, Dict[str, str], float]]:
+    """Build the (cumulative) bucket, sum and count samples of a histogram
+
+    Args:
+        name (str): the histogram's name
+        series (Iterable[Tuple[Dict[str, str], Dict[float, int], float]]): the labels, the count of
+            observations per bucket upper bound (not cumulative) and the sum of the observations of each series
+
+    Returns:
+        List[Tuple[str, Dict[str, str], float]]: the samples of the histogram
+    """
+    samples = []
+    for labels, bucket_counts, total in series:
+        cumulative = 0
+        for bound, count in bucket_counts.items():
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            samples.append((f"{name}_bucket", {**labels, "le": le}, cumulative))
+        samples.append((f"{name}_sum", labels, total))
+        samples.append((f"{name}_count", labels, cumulative))
+    return samples
+
+
+class MetricsRegistry:
+    """The metrics of the process, rendered in the Prometheus text exposition format,
+    along with the metrics collected on demand from components keeping their own stats
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()
+    ) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def drain(self) -> Dict[str, Dict]:
+        """Take the values of the metrics observed so far, resetting them,
+        e.g. for a worker process to send its metrics to the parent one
+
+        Returns:
+            Dict[str, Dict]: the values of each metric, by name
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+        return {metric.name: metric.drain() for metric in metrics}
+
+    def merge(self, values: Dict[str, Dict]) -> None:
+        """Add the values drained from the registry of another process
+
+        Args:
+            values (Dict[str, Dict]): the values of each metric, by name
+        """
+        with self._lock:
+            metrics = {metric.name: metric for metric in self._metrics}
+        for name, metric_values in values.items():
+            if name in metrics:
+                metrics[name].merge(metric_values)
+
+    def register_collector(self, collect: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Register a function returning metric families, called on every render
+
+        Args:
+            collect (Callable[[], Iterable[MetricFamily]]): the function collecting the metrics
+        """
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Render all the metrics in the Prometheus text exposition format
+
+        Returns:
+            str: the metrics
+        """
+        with self._lock:
+            families = [metric.collect() for metric in self._metrics]
+            collectors = list(self._collectors)
+        for collect in collectors:
+            try:
+                families.extend(collect())
+            except Exception as e:
+                logger.error(f"Failed to collect metrics: {e}")
+
+        lines = []
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def start_metrics_server(
+    port: int, registry: MetricsRegistry = None, ready: Callable[[], bool] = None
+) -> ThreadingHTTPServer:
+    """Serve the metrics at /metrics, for Prometheus to scrape, and the readiness of the app
+    at /ready (200 once ready, 503 before), from a background thread
+
+    Args:
+        port (int): the port to listen on, on all interfaces
+        registry (MetricsRegistry, optional): the metrics to serve. Defaults to the process-wide REGISTRY.
+        ready (Callable[[], bool], optional): checks whether the app is ready. Defaults to None (always ready).
+
+    Returns:
+        ThreadingHTTPServer: the running server
+    """
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/metrics":
+                status, body = 200, registry.render()
+            elif path == "/ready":
+                is_ready = ready is None or ready()
+                status, body = (200, "ready\n") if is_ready else (503, "starting\n")
+            else:
+                self.send_error(404)
+                return
+
+            body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    logger.info(f"Serving metrics on port {port}")
+    return server
+
+
+# The metrics of the process
+REGISTRY = MetricsRegistry()
+
+SPAN_SECONDS = REGISTRY.histogram(
+    "transum_span_seconds",
+    "Latency of the hot-path spans: fetch, parse, clean, tokenize, generate, decode, translation",
+    ("span",),
+)
+CALL_SECONDS = REGISTRY.histogram(
+    "transum_call_seconds", "Latency of the task manager's entry points", ("function",)
+)
+PIPELINE_STAGE_SECONDS = REGISTRY.histogram(
+    "transum_pipeline_stage_seconds",
+    "Processing time of a chunk of entries by each pipeline stage",
+    ("stage",),
+)
+TOKENS = REGISTRY.counter(
+    "transum_tokens",
+    "Tokens fed to and generated by the models",
+    ("model", "direction"),
+)
+GENERATE_BATCH_SIZE = REGISTRY.histogram(
+    "transum_generate_batch_size",
+    "Number of texts per batched model call",
+    ("model",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+
+
+def span(name: str):
+    """Time a block of the hot path, e.g. `with span("generate"): ...`
+
+    Args:
+        name (str): the name of the span
+
+    Returns:
+        ContextManager: the context manager observing the block's duration
+    """
+    return SPAN_SECONDS.time(span=name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator observing the duration of every call of a function
+
+    Args:
+        name (str): the function's name in the metrics
+
+    Returns:
+        Callable: the decorator
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kw):
+            with CALL_SECONDS.time(function=name):
+                return f(*args, **kw)
+
+        return wrapper
+
+    return decorator
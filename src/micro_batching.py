@@ -0,0 +1,158 @@
+import logging
+import threading
+
+from time import monotonic
+from typing import Callable, Dict, Hashable, List
+
+from metrics import BATCH_SIZE_BUCKETS
+
+
+logger = logging.getLogger("src.micro_batching")
+
+
+class MicroBatcher:
+    """Collects the texts submitted by concurrent callers within a short time window
+    (or up to a max batch size), runs them through a single batched model call,
+    and hands each caller back its own results
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process: Callable[[Hashable, List[str]], List[str]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.01,
+    ):
+        """
+        Args:
+            name (str): the name of the batcher, used in logs and metrics
+            process (Callable[[Hashable, List[str]], List[str]]): the batched model call, given the batch key
+                (only texts submitted with the same key are batched together) and the texts
+            max_batch_size (int, optional): the max number of texts per batch. Defaults to 32.
+            max_wait (float, optional): the max seconds the first text of a batch waits for others. Defaults to 0.01.
+        """
+        self.name = name
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._pending: List[Dict] = []
+        self._cond = threading.Condition()
+        self._thread = None
+
+        self._metrics = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "wait_seconds": 0.0,
+            "batch_size_buckets": {bucket: 0 for bucket in BATCH_SIZE_BUCKETS},
+        }
+
+    def __call__(self, key: Hashable, txts: List[str]) -> List[str]:
+        """Submit texts to be processed in the next batch of their key, and wait for the results
+
+        Args:
+            key (Hashable): the batch key, e.g. the model and generation params
+            txts (List[str]): the texts to process
+
+        Raises:
+            Exception: the error the batched model call failed with
+
+        Returns:
+            List[str]: the results, in the order of the input texts
+        """
+        if not txts:
+            return []
+
+        request = {
+            "key": key,
+            "txts": txts,
+            "submitted": monotonic(),
+            "done": threading.Event(),
+            "result": None,
+            "error": None,
+        }
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"batcher-{self.name}", daemon=True
+                )
+                self._thread.start()
+            self._pending.append(request)
+            self._cond.notify()
+
+        request["done"].wait()
+        if request["error"] is not None:
+            raise request["error"]
+        return request["result"]
+
+    def stats(self) -> Dict:
+        """Get the batching metrics
+
+        Returns:
+            Dict: the number of requests, texts and batches, the max batch size, the seconds
+            requests waited before their batch ran, and the histogram of batch sizes (in texts)
+        """
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics["batch_size_buckets"] = dict(self._metrics["batch_size_buckets"])
+        return metrics
+
+    def _next_batch(self) -> List[Dict]:
+        """Wait for the next batch of requests sharing the same key"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending)
+
+            # Wait for more requests, until the window closes or the batch is full
+            key = self._pending[0]["key"]
+            deadline = self._pending[0]["submitted"] + self.max_wait
+            while True:
+                size = sum(len(r["txts"]) for r in self._pending if r["key"] == key)
+                remaining = deadline - monotonic()
+                if size >= self.max_batch_size or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # The first request is always taken, even if larger than a batch
+            batch, size = [], 0
+            for request in list(self._pending):
+                if request["key"] != key:
+                    continue
+                if batch and size + len(request["txts"]) > self.max_batch_size:
+                    break
+                batch.append(request)
+                size += len(request["txts"])
+                self._pending.remove(request)
+
+            now = monotonic()
+            self._metrics["requests"] += len(batch)
+            self._metrics["texts"] += size
+            self._metrics["batches"] += 1
+            self._metrics["max_batch_size"] = max(self._metrics["max_batch_size"], size)
+            self._metrics["wait_seconds"] += sum(now - r["submitted"] for r in batch)
+            for bucket in BATCH_SIZE_BUCKETS:
+                if size <= bucket:
+                    self._metrics["batch_size_buckets"][bucket] += 1
+                    break
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.process(
+                    batch[0]["key"], [txt for r in batch for txt in r["txts"]]
+                )
+            except Exception as e:
+                logger.error(f"Batch of {self.name} failed: {e}")
+                for request in batch:
+                    request["error"] = e
+                    request["done"].set()
+                continue
+
+            start = 0
+            for request in batch:
+                request["result"] = results[start : start + len(request["txts"])]
+                start += len(request["txts"])
+                request["done"].set()
@@ -0,0 +1,102 @@
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable
+
+
+logger = logging.getLogger("src.model_registry")
+
+
+class ModelRegistry:
+    """Process-wide registry loading each model once, on first use,
+    and sharing it across all the requests served by the process
+    """
+
+    def __init__(self):
+        # Loader callables and already loaded models, keyed by model key
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+
+        # One lock per model, so that loading a model does not block the others
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, key: str, loader: Callable[[], Any]) -> None:
+        """Register the loader of a model, without loading it
+
+        Args:
+            key (str): the key the model is retrieved with
+            loader (Callable[[], Any]): callable returning the loaded model (and its companions)
+        """
+        with self._registry_lock:
+            self._loaders[key] = loader
+            self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Any:
+        """Retrieve a model, loading it in case it has not been loaded yet
+
+        Args:
+            key (str): the key of the model
+
+        Raises:
+            KeyError: error in case no loader has been registered for the key
+
+        Returns:
+            Any: the loaded model
+        """
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        if key not in self._loaders:
+            raise KeyError(f"No model registered for key '{key}'.")
+
+        # Double-checked locking, only the first caller loads the model
+        with self._locks[key]:
+            model = self._models.get(key)
+            if model is None:
+                logger.info(f"Loading model '{key}'")
+                model = self._loaders[key]()
+                self._models[key] = model
+        return model
+
+    def is_loaded(self, key: str) -> bool:
+        """Check whether a model has already been loaded
+
+        Args:
+            key (str): the key of the model
+
+        Returns:
+            bool: True if the model is loaded, False otherwise
+        """
+        return key in self._models
+
+    def warm_up(self, keys: Iterable[str] = None) -> None:
+        """Load the given models ahead of the first request, concurrently, as loading
+        is mostly spent reading the weights and in native code releasing the GIL
+
+        Args:
+            keys (Iterable[str], optional): the keys of the models to load. Defaults to None (load all).
+        """
+        keys = list(keys if keys is not None else self._loaders)
+        if len(keys) <= 1:
+            for key in keys:
+                self.get(key)
+            return
+
+        with ThreadPoolExecutor(len(keys), thread_name_prefix="model-loader") as pool:
+            # Re-raises the first loading error
+            list(pool.map(self.get, keys))
+
+    def unload(self, keys: Iterable[str] = None) -> None:
+        """Drop the given models, so that their memory can be reclaimed.
+        They are loaded again on their next use.
+
+        Args:
+            keys (Iterable[str], optional): the keys of the models to unload. Defaults to None (unload all).
+        """
+        for key in keys if keys is not None else list(self._models):
+            with self._locks[key]:
+                if self._models.pop(key, None) is not None:
+                    logger.info(f"Unloaded model '{key}'")
@@ -0,0 +1,43 @@
+import logging
+
+from pathlib import Path
+
+try:
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+except ImportError:  # optimum[onnxruntime] is only needed by the onnx backend
+    ORTModelForSeq2SeqLM = None
+
+
+logger = logging.getLogger("src.onnx_backend")
+
+
+def load_onnx_seq2seq_model(model_name: str, export_dir: str):
+    """Load a seq2seq model as exported ONNX encoder/decoder graphs, run by ONNX Runtime's
+    CPU execution provider, with the decoder reusing its past key/values across steps.
+    The graphs are exported on first use and reused, from disk, across restarts.
+
+    Args:
+        model_name (str): the name of the (PyTorch) model on the hub
+        export_dir (str): the directory the exported graphs are cached in
+
+    Raises:
+        RuntimeError: error in case optimum[onnxruntime] is not installed
+
+    Returns:
+        ORTModelForSeq2SeqLM: the model, exposing the same generate API as the PyTorch one
+    """
+    if ORTModelForSeq2SeqLM is None:
+        raise RuntimeError("The onnx backend requires optimum[onnxruntime].")
+
+    model_dir = Path(export_dir) / model_name.replace("/", "--")
+    if (model_dir / "config.json").exists():
+        return ORTModelForSeq2SeqLM.from_pretrained(
+            model_dir, use_cache=True, provider="CPUExecutionProvider"
+        )
+
+    logger.info(f"Exporting model '{model_name}' to ONNX in {model_dir}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_name, export=True, use_cache=True, provider="CPUExecutionProvider"
+    )
+    model.save_pretrained(model_dir)
+    return model
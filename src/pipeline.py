@@ -0,0 +1,173 @@
+import logging
+import queue
+import threading
+
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from metrics import PIPELINE_STAGE_SECONDS
+
+
+logger = logging.getLogger("src.pipeline")
+
+
+class _StageFailure:
+    """Wraps an exception raised by a stage, passed downstream to the consumer"""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+# Marks the end of the items flowing through the stages
+_END = object()
+
+
+class StagedPipeline:
+    """Producer/consumer pipeline running each stage in its own thread, with bounded
+    queues between the stages, so that consecutive items are processed by different
+    stages at the same time, while a slow stage applies backpressure on the faster ones
+    """
+
+    def __init__(
+        self, stages: List[Tuple[str, Callable[[Any], Any]]], queue_size: int = 2
+    ):
+        """
+        Args:
+            stages (List[Tuple[str, Callable[[Any], Any]]]): the name and function of each stage, in order
+            queue_size (int, optional): the max number of items waiting before each stage. Defaults to 2.
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+
+        self._timings = {
+            name: {
+                "items": 0,
+                "busy_seconds": 0.0,
+                "max_seconds": 0.0,
+                "wait_seconds": 0.0,
+            }
+            for name, _ in stages
+        }
+        self._timings_lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Get the cumulative per-stage timings, across all runs
+
+        Returns:
+            Dict[str, Dict]: per stage, the number of items processed, the seconds spent processing them
+            (total and max per item) and the seconds spent blocked on a full downstream queue
+        """
+        with self._timings_lock:
+            return {name: dict(timings) for name, timings in self._timings.items()}
+
+    def _record(self, name: str, busy: float, wait: float) -> None:
+        PIPELINE_STAGE_SECONDS.observe(busy, stage=name)
+        with self._timings_lock:
+            timings = self._timings[name]
+            timings["items"] += 1
+            timings["busy_seconds"] += busy
+            timings["max_seconds"] = max(timings["max_seconds"], busy)
+            timings["wait_seconds"] += wait
+
+    @staticmethod
+    def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        # Block while the queue is full, unless the run has been stopped
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(q: queue.Queue, stop: threading.Event) -> Any:
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _feed(self, items: Iterable, out_q: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for item in items:
+                if not self._put(out_q, item, stop):
+                    return
+        except Exception as e:
+            self._put(out_q, _StageFailure(e), stop)
+            return
+        self._put(out_q, _END, stop)
+
+    def _work(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        in_q: queue.Queue,
+        out_q: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        while True:
+            item = self._get(in_q, stop)
+            if item is _END or isinstance(item, _StageFailure):
+                self._put(out_q, item, stop)
+                return
+
+            ts = perf_counter()
+            try:
+                result = func(item)
+            except Exception as e:
+                self._put(out_q, _StageFailure(e), stop)
+                return
+            te = perf_counter()
+
+            if not self._put(out_q, result, stop):
+                return
+            self._record(name, te - ts, perf_counter() - te)
+
+    def run(self, items: Iterable) -> Iterator:
+        """Run the items through all the stages
+
+        Args:
+            items (Iterable): the items fed to the first stage
+
+        Raises:
+            Exception: the first exception raised by any of the stages
+
+        Yields:
+            Any: the output of the last stage for each item, in input order
+        """
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        stop = threading.Event()
+
+        threads = [
+            threading.Thread(
+                target=self._feed, args=(items, queues[0], stop), daemon=True
+            )
+        ]
+        for i, (name, func) in enumerate(self.stages):
+            threads.append(
+                threading.Thread(
+                    target=self._work,
+                    args=(name, func, queues[i], queues[i + 1], stop),
+                    name=f"pipeline-{name}",
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _END:
+                    break
+                if isinstance(item, _StageFailure):
+                    raise item.exc
+                yield item
+        finally:
+            # Also stops the stages when the consumer gives up early
+            stop.set()
+            for thread in threads:
+                thread.join()
+            logger.debug(f"Pipeline stage timings: {self.stats()}")
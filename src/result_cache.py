@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+
+from collections import OrderedDict
+from time import time
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("src.result_cache")
+
+
+class ResultCache:
+    """Content-addressed cache for the results of the summarization and translation tasks,
+    with an in-memory LRU tier in front of a size-bounded, on-disk SQLite tier
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        memory_max_entries: int = 2048,
+        disk_max_entries: int = 100000,
+    ):
+        """
+        Args:
+            db_path (str, optional): the SQLite database file of the on-disk tier. Defaults to None (memory only).
+            memory_max_entries (int, optional): the max number of entries kept in memory. Defaults to 2048.
+            disk_max_entries (int, optional): the max number of entries kept on disk. Defaults to 100000.
+        """
+        self.db_path = db_path
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+
+        self._memory: OrderedDict = OrderedDict()
+        self._conn = None
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key hashing the given parts, e.g. the input text, the model name,
+        the generation params and the source/target language codes
+
+        Returns:
+            str: the hex digest of the hashed parts
+        """
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # The database is opened on first use, not when the cache is created
+        if self._conn is None and self.db_path:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Retrieve a cached result
+
+        Args:
+            key (str): the key of the result
+
+        Returns:
+            Optional[str]: the cached result, None in case of a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+            conn = self._connection()
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE results SET accessed = ? WHERE key = ?", (time(), key)
+                    )
+                    conn.commit()
+                    self._remember(key, row[0])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a result in both tiers, evicting the least recently used entries if needed
+
+        Args:
+            key (str): the key of the result
+            value (str): the result
+        """
+        with self._lock:
+            self._remember(key, value)
+
+            conn = self._connection()
+            if conn is None:
+                return
+
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, accessed) VALUES (?, ?, ?)",
+                (key, value, time()),
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.disk_max_entries:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (count - self.disk_max_entries,),
+                )
+            conn.commit()
+
+    def clear(self) -> None:
+        """Remove all the cached results from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM results")
+                conn.commit()
+
+    def stats(self) -> Dict:
+        """Get the hit/miss counters of the cache
+
+        Returns:
+            Dict: the memory hits, disk hits, misses and overall hit rate
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            ),
+        }
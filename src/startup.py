@@ -0,0 +1,146 @@
+import logging
+import threading
+
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from metrics import MetricFamily
+
+
+logger = logging.getLogger("src.startup")
+
+
+class Startup:
+    """Runs the slow steps of the application's startup (heavy imports, model loading,
+    background services) in order, in a background thread so that the interface can bind
+    right away, signalling readiness once all of them are done. The cold start, from the
+    process start to readiness, is measured against a time budget.
+    """
+
+    def __init__(
+        self,
+        steps: List[Tuple[str, Callable[[], None]]],
+        budget: float,
+        started: float = None,
+    ):
+        """
+        Args:
+            steps (List[Tuple[str, Callable[[], None]]]): the name and function of each startup step, in order
+            budget (float): the cold start time budget, in seconds
+            started (float, optional): the perf_counter() value at the process start. Defaults to None (now).
+        """
+        self.steps = steps
+        self.budget = budget
+        self.started = perf_counter() if started is None else started
+
+        self.step_seconds: Dict[str, float] = {}
+        self.ready_seconds = None
+        self.error = None
+
+        self._step = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Run the startup steps in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, name="startup", daemon=True
+            )
+            self._thread.start()
+
+    def run(self) -> None:
+        """Run the startup steps in the calling thread, a failing step stopping the startup"""
+        for name, step in self.steps:
+            self._step = name
+            ts = perf_counter()
+            try:
+                step()
+            except Exception as e:
+                self.error = e
+                logger.error(f"Startup failed at step '{name}': {e}")
+                return
+            self.step_seconds[name] = perf_counter() - ts
+            logger.info(f"Startup step '{name}' took {self.step_seconds[name]:.2f} sec")
+
+        self.ready_seconds = perf_counter() - self.started
+        self._ready.set()
+        if self.ready_seconds > self.budget:
+            logger.warning(
+                f"Ready in {self.ready_seconds:.2f} sec, over the cold start budget of {self.budget:.0f} sec"
+            )
+        else:
+            logger.info(f"Ready in {self.ready_seconds:.2f} sec")
+
+    def is_ready(self) -> bool:
+        """Check whether all the startup steps are done
+
+        Returns:
+            bool: True once ready to serve requests, False otherwise
+        """
+        return self._ready.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wait for the startup to be done
+
+        Args:
+            timeout (float, optional): the max seconds to wait. Defaults to None (no limit).
+
+        Returns:
+            bool: True if ready, False if the timeout expired first
+        """
+        return self._ready.wait(timeout)
+
+    def status(self) -> str:
+        """Describe the startup's progress, e.g. for the interface
+
+        Returns:
+            str: the status message
+        """
+        if self.error is not None:
+            return f"Startup failed at step '{self._step}': {self.error}"
+        if self.is_ready():
+            return f"Ready (started in {self.ready_seconds:.1f} sec)"
+        return (
+            f"Starting up ({self._step or 'waiting'}), requests are served once ready"
+        )
+
+    def collect_metrics(self) -> List[MetricFamily]:
+        """Collect the readiness and startup timings, in the format of the metrics registry's collectors
+
+        Returns:
+            List[MetricFamily]: the metric families
+        """
+        families = [
+            (
+                "transum_ready",
+                "gauge",
+                "Whether the app serves requests",
+                [("transum_ready", {}, int(self.is_ready()))],
+            ),
+            (
+                "transum_startup_step_seconds",
+                "gauge",
+                "Duration of each startup step",
+                [
+                    ("transum_startup_step_seconds", {"step": name}, seconds)
+                    for name, seconds in self.step_seconds.items()
+                ],
+            ),
+            (
+                "transum_cold_start_budget_seconds",
+                "gauge",
+                "Cold start time budget",
+                [("transum_cold_start_budget_seconds", {}, self.budget)],
+            ),
+        ]
+        if self.ready_seconds is not None:
+            families.append(
+                (
+                    "transum_cold_start_seconds",
+                    "gauge",
+                    "Time from the process start to readiness",
+                    [("transum_cold_start_seconds", {}, self.ready_seconds)],
+                )
+            )
+        return families
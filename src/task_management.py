@@ -1,14 +1,13 @@
+import asyncio
 import logging
-import logging.config
+import threading
 
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import feedparser
 import torch
 
-from bs4 import BeautifulSoup
-from functools import wraps
-from time import time
+from functools import partial
 from pydantic import HttpUrl
 from transformers import (
     AutoConfig,
@@ -17,24 +16,215 @@ from transformers import (
     pipeline,
 )
 
-from config import LANGUAGES, LANG_LEX_2_CODE
-from logging_conf import LOGGING_CONFIG
+from config import (
+    CACHE_DB_PATH,
+    CACHE_DISK_MAX_ENTRIES,
+    CACHE_MEMORY_MAX_ENTRIES,
+    FEED_STATE_DB_PATH,
+    LANGUAGES,
+    LANG_LEX_2_CODE,
+    MICRO_BATCHING,
+    MICRO_BATCH_MAX_SIZE,
+    MICRO_BATCH_MAX_WAIT,
+    MODEL_BACKEND,
+    MODEL_PRECISION,
+    MULTILINGUAL_SUMMARIZATION_MODEL_NAME,
+    ONNX_EXPORT_DIR,
+    PIPELINE_QUEUE_SIZE,
+    PROCESSING_STRATEGY,
+    STREAM_CHUNK_SIZE,
+    SUMMARIZATION_BATCH_SIZE,
+    SUMMARIZATION_MAX_CHUNKS,
+    SUMMARIZATION_MODEL_LANGUAGES,
+    SUMMARIZATION_MODEL_NAME,
+    TEXT_EXTRACTOR,
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_MODEL_NAME,
+    WORKER_POOL_SIZE,
+)
+from logging_conf import setup_logging
+from feed_ingestion import ingest_feeds
+from entries import ProcessedEntry
+from feed_state import FeedStateStore
+from generation_policy import GenerationPolicy
+from metrics import (
+    GENERATE_BATCH_SIZE,
+    TOKENS,
+    REGISTRY,
+    MetricFamily,
+    histogram_samples,
+    span,
+    timed,
+)
+from micro_batching import MicroBatcher
+from model_registry import ModelRegistry
+from onnx_backend import load_onnx_seq2seq_model
+from pipeline import StagedPipeline
+from result_cache import ResultCache
+from text_extraction import get_text_extractor
+from worker_pool import WorkerPool
 
 
-logging.config.dictConfig(LOGGING_CONFIG)
+setup_logging()
 logger = logging.getLogger("src.task_management")
 
 
-def proc_timer(f):
-    @wraps(f)
-    def wrapper(*args, **kw):
-        ts = time()
-        result = f(*args, **kw)
-        te = time()
-        logger.info(f"func:{f.__name__} args:[{args}, {kw}] took: {te - ts}:%2.4f sec")
-        return result
+SUMMARIZATION_MODEL_KEY = "summarization"
+MULTILINGUAL_SUMMARIZATION_MODEL_KEY = "multilingual_summarization"
+TRANSLATION_MODEL_KEY = "translation"
+
+# The models' names, by model key
+MODEL_NAMES = {
+    SUMMARIZATION_MODEL_KEY: SUMMARIZATION_MODEL_NAME,
+    MULTILINGUAL_SUMMARIZATION_MODEL_KEY: MULTILINGUAL_SUMMARIZATION_MODEL_NAME,
+    TRANSLATION_MODEL_KEY: TRANSLATION_MODEL_NAME,
+}
+
+# The processing strategies of non-English feeds:
+# "pivot": translate the content to English, summarize it and translate the summary to the target language
+# "multilingual": summarize the content in its language, with a multilingual summarizer,
+# and translate only the summary, directly; it falls back to "pivot" for the languages
+# the summarizer does not support (SUMMARIZATION_MODEL_LANGUAGES)
+PROCESSING_STRATEGIES = ("pivot", "multilingual")
+
+
+def _get_device() -> torch.device:
+    """Get the device the models should run on
+
+    Returns:
+        torch.device: the GPU if available, CPU otherwise
+    """
+    return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+
+def _apply_precision(model: torch.nn.Module, precision: str, device: torch.device):
+    """Convert a loaded model to the given precision
 
-    return wrapper
+    Args:
+        model (torch.nn.Module): the model, in full fp32 precision
+        precision (str): "fp32", "bf16" or "int8" (dynamic quantization of the Linear layers)
+        device (torch.device): the device the model runs on
+
+    Raises:
+        RuntimeError: error in case of unsupported precision
+
+    Returns:
+        torch.nn.Module: the converted model
+    """
+    if precision == "fp32":
+        return model
+    if precision == "bf16":
+        return model.to(torch.bfloat16)
+    if precision == "int8":
+        # Dynamic quantization kernels are CPU only
+        if device.type != "cpu":
+            logger.warning("int8 precision is only supported on CPU, using fp32")
+            return model
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    raise RuntimeError(f"Unsupported model precision '{precision}'.")
+
+
+def _load_seq2seq_model(
+    model_name: str, precision: str, backend: str, device: torch.device
+):
+    """Load a seq2seq model with the given backend
+
+    Args:
+        model_name (str): the name of the model
+        precision (str): the precision of the model (PyTorch backend only)
+        backend (str): "pytorch" (eager PyTorch) or "onnx" (exported graphs run by ONNX Runtime on CPU)
+        device (torch.device): the device the model runs on (PyTorch backend only)
+
+    Raises:
+        RuntimeError: error in case of unsupported backend
+
+    Returns:
+        the model, exposing the generate API
+    """
+    if backend == "pytorch":
+        # Weights are memory-mapped from the safetensors checkpoint and loaded straight
+        # into the model (in bf16 directly, if requested), without a randomly-initialized copy
+        model = AutoModelForSeq2SeqLM.from_pretrained(
+            model_name,
+            low_cpu_mem_usage=True,
+            torch_dtype=torch.bfloat16 if precision == "bf16" else None,
+        ).to(device)
+        return _apply_precision(model.eval(), precision, device)
+    if backend == "onnx":
+        if precision != "fp32":
+            logger.warning(
+                f"{precision} precision is not supported by the onnx backend"
+            )
+        return load_onnx_seq2seq_model(model_name, ONNX_EXPORT_DIR)
+    raise RuntimeError(f"Unsupported model backend '{backend}'.")
+
+
+def _load_summarization_model(
+    precision: str = MODEL_PRECISION,
+    backend: str = MODEL_BACKEND,
+    model_name: str = SUMMARIZATION_MODEL_NAME,
+) -> Dict:
+    """Load a summarization model, its config and tokenizer
+
+    Args:
+        precision (str, optional): the precision of the model. Defaults to MODEL_PRECISION.
+        backend (str, optional): the backend running the model. Defaults to MODEL_BACKEND.
+        model_name (str, optional): the name of the model. Defaults to SUMMARIZATION_MODEL_NAME.
+
+    Returns:
+        Dict: the summarization model, config, tokenizer and device
+    """
+    device = _get_device() if backend == "pytorch" else torch.device("cpu")
+    return {
+        "config": AutoConfig.from_pretrained(model_name),
+        "model": _load_seq2seq_model(model_name, precision, backend, device),
+        "tokenizer": AutoTokenizer.from_pretrained(model_name),
+        "device": device,
+    }
+
+
+def _load_translation_model(
+    precision: str = MODEL_PRECISION, backend: str = MODEL_BACKEND
+) -> Dict:
+    """Load the translation pipeline
+
+    Args:
+        precision (str, optional): the precision of the pipeline's model. Defaults to MODEL_PRECISION.
+        backend (str, optional): the backend running the pipeline's model. Defaults to MODEL_BACKEND.
+
+    Returns:
+        Dict: the translation pipeline and device
+    """
+    device = _get_device() if backend == "pytorch" else torch.device("cpu")
+    return {
+        "pipeline": pipeline(
+            "translation",
+            model=_load_seq2seq_model(
+                TRANSLATION_MODEL_NAME, precision, backend, device
+            ),
+            tokenizer=AutoTokenizer.from_pretrained(TRANSLATION_MODEL_NAME),
+            device=device if backend == "pytorch" else None,
+        ),
+        "device": device,
+    }
+
+
+# Models are loaded once per process, on first use, and shared by all task managers
+model_registry = ModelRegistry()
+model_registry.register(SUMMARIZATION_MODEL_KEY, _load_summarization_model)
+model_registry.register(
+    MULTILINGUAL_SUMMARIZATION_MODEL_KEY,
+    partial(
+        _load_summarization_model, model_name=MULTILINGUAL_SUMMARIZATION_MODEL_NAME
+    ),
+)
+model_registry.register(TRANSLATION_MODEL_KEY, _load_translation_model)
+
+# The translation pipeline sets the source language on its (shared) tokenizer at each
+# call, so the calls of the pipeline stages and of the task managers must not overlap
+_translator_lock = threading.Lock()
 
 
 class TaskManager:
@@ -42,46 +232,320 @@ class TaskManager:
     feed-parsing and other necessary processing tasks
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        registry: ModelRegistry = None,
+        cache: Optional[ResultCache] = None,
+        feed_state: Optional[FeedStateStore] = None,
+        strategy: str = PROCESSING_STRATEGY,
+        micro_batching: bool = MICRO_BATCHING,
+        workers: int = WORKER_POOL_SIZE,
+        policy: GenerationPolicy = None,
+    ):
         # The supported, by our application, translation languages
         self.supported_langs = LANGUAGES.values()
 
-        # Load the bart-large-cnn model and tokenizer
-        summarization_model_name = "facebook/bart-large-cnn"
+        # The registry the (shared) models are retrieved from
+        self.registry = registry or model_registry
 
-        # Move model for summarization to GPU if available
-        # self.summarization_device = (
-        #     0 if torch.cuda.is_available() else -1
-        # )  # 0 for GPU, -1 for CPU
-        self.summarization_device = torch.device(
-            "cuda" if torch.cuda.is_available() else "cpu"
-        )
+        # The cache of summarization and translation results (None disables caching)
+        self.cache = cache
+
+        # The store of feed validators and processed entries (None disables incremental processing)
+        self.feed_state = feed_state
 
-        self.summarization_config = AutoConfig.from_pretrained(summarization_model_name)
+        # The processing strategy of non-English feeds, one of PROCESSING_STRATEGIES
+        if strategy not in PROCESSING_STRATEGIES:
+            raise RuntimeError(f"Unsupported processing strategy '{strategy}'.")
+        self.strategy = strategy
 
-        self.summarizer = AutoModelForSeq2SeqLM.from_pretrained(
-            summarization_model_name
-        ).to(self.summarization_device)
+        # The generation effort per input (beams, skipped summaries, translation lengths)
+        self.policy = policy or GenerationPolicy()
 
-        self.summarization_tokenizer = AutoTokenizer.from_pretrained(
-            summarization_model_name
+        # Merge the model calls of concurrent requests into shared batches
+        self.summarize_batcher = self.translate_batcher = None
+        if micro_batching:
+            self.summarize_batcher = MicroBatcher(
+                "summarize",
+                self._generate_summaries_for_key,
+                max_batch_size=MICRO_BATCH_MAX_SIZE,
+                max_wait=MICRO_BATCH_MAX_WAIT,
+            )
+            self.translate_batcher = MicroBatcher(
+                "translate",
+                self._generate_translations_for_key,
+                max_batch_size=MICRO_BATCH_MAX_SIZE,
+                max_wait=MICRO_BATCH_MAX_WAIT,
+            )
+
+        # The inference worker processes, sharing the models loaded in this one
+        self.worker_pool = None
+        if workers > 1:
+            self.worker_pool = WorkerPool(self._new_worker_task_manager, workers)
+
+        # The extractor of the text from the entries' HTML contents
+        self.extract_text = get_text_extractor(TEXT_EXTRACTOR)
+
+        # The stages processing chunks of feed entries
+        self.pipeline = StagedPipeline(
+            [
+                ("clean", self._clean_stage),
+                ("pre_translate", self._pre_translate_stage),
+                ("summarize", self._summarize_stage),
+                ("translate", self._translate_stage),
+            ],
+            queue_size=PIPELINE_QUEUE_SIZE,
         )
 
-        # Check if CUDA is available and set the device
-        self.translation_device = torch.device(
-            "cuda" if torch.cuda.is_available() else "cpu"
+    @property
+    def summarization_config(self):
+        return self.registry.get(SUMMARIZATION_MODEL_KEY)["config"]
+
+    @property
+    def summarizer(self):
+        return self.registry.get(SUMMARIZATION_MODEL_KEY)["model"]
+
+    @property
+    def summarization_tokenizer(self):
+        return self.registry.get(SUMMARIZATION_MODEL_KEY)["tokenizer"]
+
+    @property
+    def summarization_device(self) -> torch.device:
+        return self.registry.get(SUMMARIZATION_MODEL_KEY)["device"]
+
+    @property
+    def translator(self):
+        return self.registry.get(TRANSLATION_MODEL_KEY)["pipeline"]
+
+    @property
+    def translation_max_length(self) -> Optional[int]:
+        generation_config = getattr(self.translator.model, "generation_config", None)
+        return getattr(generation_config, "max_length", None)
+
+    @property
+    def translation_device(self) -> torch.device:
+        return self.registry.get(TRANSLATION_MODEL_KEY)["device"]
+
+    def warm_up(self) -> None:
+        """Load all the models ahead of the first request, so that request
+        latency is only inference time, and start the worker processes sharing them
+        """
+        model_keys = [SUMMARIZATION_MODEL_KEY, TRANSLATION_MODEL_KEY]
+        if self.strategy == "multilingual":
+            model_keys.append(MULTILINGUAL_SUMMARIZATION_MODEL_KEY)
+        self.registry.warm_up(model_keys)
+        if self.worker_pool is not None:
+            self.worker_pool.start()
+
+    def unload(self) -> None:
+        """Stop the worker processes, unload all the models and release the cached device memory"""
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+        self.registry.unload()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _new_worker_task_manager(self) -> "TaskManager":
+        """Create the task manager of a worker process, sharing the models loaded in this one"""
+        cache = None
+        if self.cache is not None:
+            # SQLite connections must not be used across a fork
+            cache = ResultCache(
+                self.cache.db_path,
+                memory_max_entries=self.cache.memory_max_entries,
+                disk_max_entries=self.cache.disk_max_entries,
+            )
+        return TaskManager(
+            registry=self.registry,
+            cache=cache,
+            strategy=self.strategy,
+            micro_batching=False,
+            workers=1,
+            policy=self.policy,
         )
 
-        # Load translation pipeline for model facebook/nllb-200-distilled-1.3B
-        self.translator = pipeline(
-            "translation",
-            model="facebook/nllb-200-distilled-1.3B",
-            device=self.translation_device,
+    def batching_stats(self) -> Dict[str, Dict]:
+        """Get the metrics of the micro-batchers of the model calls
+
+        Returns:
+            Dict[str, Dict]: the metrics of each batcher, by name, empty if micro-batching is disabled
+        """
+        return {
+            batcher.name: batcher.stats()
+            for batcher in (self.summarize_batcher, self.translate_batcher)
+            if batcher is not None
+        }
+
+    def collect_metrics(self) -> List[MetricFamily]:
+        """Collect the metrics kept by the result cache and the micro-batchers,
+        in the format of the metrics registry's collectors
+
+        Returns:
+            List[MetricFamily]: the metric families
+        """
+        families = []
+        if self.cache is not None:
+            stats = self.cache.stats()
+            families.append(
+                (
+                    "transum_cache_requests",
+                    "counter",
+                    "Result cache lookups, by outcome",
+                    [
+                        ("transum_cache_requests_total", {"result": result}, stats[key])
+                        for result, key in (
+                            ("memory_hit", "memory_hits"),
+                            ("disk_hit", "disk_hits"),
+                            ("miss", "misses"),
+                        )
+                    ],
+                )
+            )
+
+        batching_stats = self.batching_stats()
+        if batching_stats:
+            families.append(
+                (
+                    "transum_micro_batch_size",
+                    "histogram",
+                    "Number of texts per micro-batch of concurrent model calls",
+                    histogram_samples(
+                        "transum_micro_batch_size",
+                        [
+                            (
+                                {"batcher": name},
+                                stats["batch_size_buckets"],
+                                stats["texts"],
+                            )
+                            for name, stats in batching_stats.items()
+                        ],
+                    ),
+                )
+            )
+            families.append(
+                (
+                    "transum_micro_batch_wait_seconds",
+                    "counter",
+                    "Seconds the model calls waited for their micro-batch to run",
+                    [
+                        (
+                            "transum_micro_batch_wait_seconds_total",
+                            {"batcher": name},
+                            stats["wait_seconds"],
+                        )
+                        for name, stats in batching_stats.items()
+                    ],
+                )
+            )
+        return families
+
+    def _summary_lengths(
+        self, config, full_text_length: int, max_length: int, min_length: int
+    ) -> Tuple[int, int]:
+        """Adapt the max and min lengths of a summary to the length of the text to summarize
+
+        Args:
+            config (PretrainedConfig): the config of the summarization model
+            full_text_length (int): the length, in tokens, of the text to summarize
+            max_length (int): the max_length downlimit of the summarized text
+            min_length (int): the min_length downlimit of the summarized text
+
+        Returns:
+            Tuple[int, int]: the adapted max and min lengths
+        """
+
+        # Adapt max and min lengths for summary, if larger than they should be
+        max_perc_init_length = round(full_text_length * 0.3)
+        max_length = (
+            max_perc_init_length
+            if config.max_length > 0.5 * full_text_length
+            else max(max_length, config.max_length)
         )
 
-    # @proc_timer
+        # Min length is the minimum of the following two:
+        # the min to max default config values factor, multiplied by real max
+        # the default config minimum value
+        min_to_max_perc = config.min_length / config.max_length
+        min_length = min(round(min_to_max_perc * max_length), config.min_length)
+
+        return max_length, min_length
+
+    @staticmethod
+    def _run_batched(
+        batcher: Optional[MicroBatcher],
+        generate: Callable[[Tuple, List[str]], List[str]],
+        key: Tuple,
+        txts: List[str],
+    ) -> List[str]:
+        """Run a model call directly, or through its micro-batcher, merging it with the
+        calls of concurrent requests sharing the same key
+        """
+        if batcher is None:
+            return generate(key, txts)
+        return batcher(key, txts)
+
+    @staticmethod
+    def _max_input_tokens(config) -> int:
+        """Get the max number of input tokens of a model, from its config"""
+        # Models with relative positions (e.g. T5) have no absolute max, use their training length
+        return getattr(config, "max_position_embeddings", None) or 512
+
+    def _cached_batch(
+        self,
+        txts: List[str],
+        key_parts: Tuple,
+        generate: Callable[[List[str]], List[str]],
+        preferred_key_parts: Optional[Tuple] = None,
+    ) -> List[str]:
+        """Look the results of a task up in the cache, running the task only on the missing texts
+
+        Args:
+            txts (List[str]): the input texts of the task
+            key_parts (Tuple): the task name, model name, generation params and language codes
+            generate (Callable[[List[str]], List[str]]): the task, run on the texts missing from the cache
+            preferred_key_parts (Optional[Tuple], optional): the key parts of better results of the task
+                (e.g. generated with more beams), looked up first and served when cached. Defaults to None.
+
+        Returns:
+            List[str]: the results of the task, in the order of the input texts
+        """
+        if self.cache is None:
+            return generate(txts)
+
+        keys = [self.cache.make_key(txt, *key_parts) for txt in txts]
+        results = [None] * len(txts)
+        if preferred_key_parts is not None and preferred_key_parts != key_parts:
+            results = [
+                self.cache.get(self.cache.make_key(txt, *preferred_key_parts))
+                for txt in txts
+            ]
+        results = [
+            self.cache.get(key) if result is None else result
+            for key, result in zip(keys, results)
+        ]
+
+        # Each distinct missing text is processed only once
+        missing = {}
+        for i, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            generated = generate([txts[indices[0]] for indices in missing.values()])
+            for (key, indices), result in zip(missing.items(), generated):
+                self.cache.set(key, result)
+                for i in indices:
+                    results[i] = result
+
+        return results
+
     def summarize(
-        self, txt_to_summarize: str, max_length: int = 30, min_length: int = 10
+        self,
+        txt_to_summarize: str,
+        max_length: int = 30,
+        min_length: int = 10,
+        model_key: str = SUMMARIZATION_MODEL_KEY,
+        interactive: bool = False,
     ) -> str:
         """Summarization task, used for summarizing the provided text
 
@@ -89,53 +553,264 @@ class TaskManager:
             txt_to_summarize (str): the text that need to be summarized
             max_length (int, optional): the max_length downlimit of the summarized text. Defaults to 30.
             min_length (int, optional): the min_length downlimit of the summarized text. Defaults to 10.
+            model_key (str, optional): the key of the summarization model. Defaults to SUMMARIZATION_MODEL_KEY.
+            interactive (bool, optional): whether a user is waiting for the summary. Defaults to False.
 
         Returns:
             str: the summarized text
         """
+        return self.summarize_batch(
+            [txt_to_summarize],
+            max_length=max_length,
+            min_length=min_length,
+            model_key=model_key,
+            interactive=interactive,
+        )[0]
 
-        full_text_length = len(txt_to_summarize)
+    @timed("summarize_batch")
+    def summarize_batch(
+        self,
+        txts_to_summarize: List[str],
+        max_length: int = 30,
+        min_length: int = 10,
+        batch_size: int = SUMMARIZATION_BATCH_SIZE,
+        model_key: str = SUMMARIZATION_MODEL_KEY,
+        interactive: bool = False,
+    ) -> List[str]:
+        """Summarization task for many texts at once. Texts sharing the same adapted
+        summary lengths and beams are grouped by token length and summarized in padded batches.
+        Texts longer than the model's input are summarized chunk by chunk, and the
+        combined chunk summaries are summarized once more. Texts already within the
+        summary's max length are kept as they are.
 
-        # Adapt max and min lengths for summary, if larger than they should be
-        max_perc_init_length = round(full_text_length * 0.3)
-        max_length = (
-            max_perc_init_length
-            if self.summarization_config.max_length > 0.5 * full_text_length
-            else max(max_length, self.summarization_config.max_length)
+        Args:
+            txts_to_summarize (List[str]): the texts that need to be summarized
+            max_length (int, optional): the max_length downlimit of the summarized texts. Defaults to 30.
+            min_length (int, optional): the min_length downlimit of the summarized texts. Defaults to 10.
+            batch_size (int, optional): the max number of texts per generation batch. Defaults to SUMMARIZATION_BATCH_SIZE.
+            model_key (str, optional): the key of the summarization model. Defaults to SUMMARIZATION_MODEL_KEY.
+            interactive (bool, optional): whether a user is waiting for the summaries, trading
+                quality for latency. Defaults to False.
+
+        Returns:
+            List[str]: the summarized texts, in the order of the input texts
+        """
+        # Interactive requests are keyed on the fewer beams they use, and served the
+        # full-beam summaries of the background refreshes when these are cached
+        return self._cached_batch(
+            txts_to_summarize,
+            self._summary_key_parts(model_key, max_length, min_length, interactive),
+            partial(
+                self._run_batched,
+                self.summarize_batcher,
+                self._generate_summaries_for_key,
+                (model_key, max_length, min_length, batch_size, interactive),
+            ),
+            preferred_key_parts=(
+                self._summary_key_parts(model_key, max_length, min_length)
+                if interactive
+                else None
+            ),
         )
 
-        # Min length is the minimum of the following two:
-        # the min to max default config values factor, multiplied by real max
-        # the default config minimum value
-        min_to_max_perc = (
-            self.summarization_config.min_length / self.summarization_config.max_length
+    def _summary_key_parts(
+        self,
+        model_key: str,
+        max_length: int,
+        min_length: int,
+        interactive: bool = False,
+    ) -> Tuple:
+        return (
+            "summarize",
+            MODEL_NAMES[model_key],
+            {
+                "max_length": max_length,
+                "min_length": min_length,
+                "policy": self.policy.params(interactive),
+                "max_chunks": SUMMARIZATION_MAX_CHUNKS,
+                "precision": MODEL_PRECISION,
+                "backend": MODEL_BACKEND,
+            },
         )
-        min_length = min(
-            round(min_to_max_perc * max_length), self.summarization_config.min_length
+
+    def _generate_summaries_for_key(
+        self,
+        key: Tuple[str, int, int, int, bool],
+        txts_to_summarize: List[str],
+    ) -> List[str]:
+        model_key, max_length, min_length, batch_size, interactive = key
+        return self._generate_summaries(
+            self.registry.get(model_key),
+            txts_to_summarize,
+            max_length,
+            min_length,
+            batch_size,
+            interactive,
         )
 
-        # Tokenize input
-        inputs = self.summarization_tokenizer(
-            txt_to_summarize, return_tensors="pt", max_length=1024, truncation=True
-        ).to(self.summarization_device)
+    def _generate_summaries(
+        self,
+        models: Dict,
+        txts_to_summarize: List[str],
+        max_length: int,
+        min_length: int,
+        batch_size: int,
+        interactive: bool = False,
+    ) -> List[str]:
+        """Summarize the texts, in map-reduce mode for texts longer than the model's input:
+        a long text is split into token chunks, all chunks are summarized in batches,
+        and the combined chunk summaries are summarized once more
+        """
+        if not txts_to_summarize:
+            return []
+
+        # Count the tokens of the inputs, without truncation
+        with span("tokenize"):
+            input_ids = models["tokenizer"](
+                txts_to_summarize, add_special_tokens=False
+            )["input_ids"]
+
+        # Room left for the special tokens in the model's input
+        chunk_tokens = self._max_input_tokens(models["config"]) - 2
 
-        # Generate summary with custom max_length
-        summary_ids = self.summarizer.generate(
-            inputs["input_ids"],
-            max_length=max_length,  # Set max_length here
-            min_length=min_length,  # Set min_length here
-            num_beams=4,  # Optional: Use beam search
-            early_stopping=True,  # Optional: Stop early if EOS is reached
+        # Map: split each long text into balanced token chunks, bounding their number to bound latency
+        summaries = [[] for _ in txts_to_summarize]
+        chunks, chunk_owners = [], []
+        for i, (txt, ids) in enumerate(zip(txts_to_summarize, input_ids)):
+            # Texts already within the summary's budget are kept as they are
+            if self.policy.skip_summary(len(ids), max_length):
+                summaries[i].append(txt.strip())
+                continue
+
+            if len(ids) <= chunk_tokens:
+                chunks.append(txt)
+                chunk_owners.append(i)
+                continue
+
+            ids = ids[: chunk_tokens * SUMMARIZATION_MAX_CHUNKS]
+            chunks_num = -(-len(ids) // chunk_tokens)
+            chunk_len = -(-len(ids) // chunks_num)
+            for start in range(0, len(ids), chunk_len):
+                chunks.append(
+                    models["tokenizer"].decode(ids[start : start + chunk_len])
+                )
+                chunk_owners.append(i)
+
+        chunk_summaries = self._summarize_chunks(
+            models, chunks, max_length, min_length, batch_size, interactive
         )
 
-        # Decode the summary
-        summary_txt = self.summarization_tokenizer.decode(
-            summary_ids[0], skip_special_tokens=True
+        for i, chunk_summary in zip(chunk_owners, chunk_summaries):
+            summaries[i].append(chunk_summary)
+
+        # Reduce: summarize the combined chunk summaries of the long texts
+        long_txts = [i for i, summary in enumerate(summaries) if len(summary) > 1]
+        for i, summary in zip(
+            long_txts,
+            self._summarize_chunks(
+                models,
+                [" ".join(summaries[i]) for i in long_txts],
+                max_length,
+                min_length,
+                batch_size,
+                interactive,
+            ),
+        ):
+            summaries[i] = [summary]
+
+        return [summary[0] for summary in summaries]
+
+    def _summarize_chunks(
+        self,
+        models: Dict,
+        txts_to_summarize: List[str],
+        max_length: int,
+        min_length: int,
+        batch_size: int,
+        interactive: bool = False,
+    ) -> List[str]:
+        """Summarize texts fitting the model's input in padded batches"""
+        if not txts_to_summarize:
+            return []
+
+        # Tokenize all inputs once, padding happens per batch
+        with span("tokenize"):
+            input_ids = models["tokenizer"](
+                txts_to_summarize,
+                max_length=self._max_input_tokens(models["config"]),
+                truncation=True,
+            )["input_ids"]
+        model_name = models["config"].name_or_path or type(models["model"]).__name__
+
+        # Summary lengths and beams are adapted per input, generation needs them per batch,
+        # so group by adapted lengths and beams first and by token length within a group
+        lengths = [
+            (
+                *self._summary_lengths(
+                    models["config"], len(ids), max_length, min_length
+                ),
+                self.policy.summary_num_beams(len(ids), interactive),
+            )
+            for ids in input_ids
+        ]
+        order = sorted(
+            range(len(input_ids)),
+            key=lambda i: (lengths[i], len(input_ids[i])),
         )
 
-        return summary_txt
+        summaries = [None] * len(input_ids)
+        start = 0
+        while start < len(order):
+            # Batch consecutive inputs sharing the same adapted lengths
+            end = start + 1
+            while (
+                end < len(order)
+                and end - start < batch_size
+                and lengths[order[end]] == lengths[order[start]]
+            ):
+                end += 1
+            batch = order[start:end]
+            batch_max_length, batch_min_length, batch_num_beams = lengths[batch[0]]
+
+            inputs = (
+                models["tokenizer"]
+                .pad({"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt")
+                .to(models["device"])
+            )
+
+            # Generate summaries with custom max_length
+            with span("generate"):
+                summary_ids = models["model"].generate(
+                    inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                    max_length=batch_max_length,  # Set max_length here
+                    min_length=batch_min_length,  # Set min_length here
+                    num_beams=batch_num_beams,  # Beam search, or greedy search for 1 beam
+                    # Stop early if EOS is reached, only valid for beam search
+                    **({"early_stopping": True} if batch_num_beams > 1 else {}),
+                )
+            GENERATE_BATCH_SIZE.observe(len(batch), model=model_name)
+            TOKENS.inc(
+                int(inputs["attention_mask"].sum()), model=model_name, direction="in"
+            )
+            TOKENS.inc(
+                int((summary_ids != models["tokenizer"].pad_token_id).sum()),
+                model=model_name,
+                direction="out",
+            )
+
+            # Decode the summaries
+            with span("decode"):
+                summary_txts = models["tokenizer"].batch_decode(
+                    summary_ids, skip_special_tokens=True
+                )
+            for i, summary_txt in zip(batch, summary_txts):
+                summaries[i] = summary_txt
+
+            start = end
+
+        return summaries
 
-    # @proc_timer
     def translate(self, txt_to_translate: str, src_lang: str, tgt_lang: str) -> str:
         """Translate the provided text from a source language to a target language
 
@@ -152,6 +827,33 @@ class TaskManager:
         Returns:
             str: the translated text
         """
+        return self.translate_batch([txt_to_translate], src_lang, tgt_lang)[0]
+
+    @timed("translate_batch")
+    def translate_batch(
+        self,
+        txts_to_translate: List[str],
+        src_lang: str,
+        tgt_lang: str,
+        batch_size: int = TRANSLATION_BATCH_SIZE,
+    ) -> List[str]:
+        """Translate the provided texts from a source language to a target language,
+        in batches of texts with similar lengths
+
+        Args:
+            txts_to_translate (List[str]): the texts to translate
+            src_lang (str): the source language of the initial texts
+            tgt_lang (str): the target language the initial texts should be translated to
+            batch_size (int, optional): the max number of texts per translation batch. Defaults to TRANSLATION_BATCH_SIZE.
+
+        Raises:
+            RuntimeError: error in case of unsupported source language
+            RuntimeError: error in case of unsupported target language
+            RuntimeError: error in case of translation failure
+
+        Returns:
+            List[str]: the translated texts, in the order of the input texts
+        """
 
         # Raise error in case of unsupported languages
         if src_lang not in self.supported_langs:
@@ -159,18 +861,271 @@ class TaskManager:
         if tgt_lang not in self.supported_langs:
             raise RuntimeError("Unsupported target language.")
 
-        # Translate the text using the NLLB model
+        # Translate the texts using the NLLB model
         src_lang = LANG_LEX_2_CODE.get(src_lang, src_lang)
         tgt_lang = LANG_LEX_2_CODE.get(tgt_lang, tgt_lang)
-        translated_text = self.translator(
-            txt_to_translate, src_lang=src_lang, tgt_lang=tgt_lang, batch_size=10
-        )[0]["translation_text"]
 
-        # If something goes wrong with the translation raise error
-        if len(translated_text) <= 0:
-            raise RuntimeError("Failed to generate translation.")
+        return self._cached_batch(
+            txts_to_translate,
+            (
+                "translate",
+                TRANSLATION_MODEL_NAME,
+                {
+                    "precision": MODEL_PRECISION,
+                    "backend": MODEL_BACKEND,
+                    "policy": self.policy.params(),
+                },
+                src_lang,
+                tgt_lang,
+            ),
+            partial(
+                self._run_batched,
+                self.translate_batcher,
+                self._generate_translations_for_key,
+                (src_lang, tgt_lang, batch_size),
+            ),
+        )
+
+    def _generate_translations_for_key(
+        self, key: Tuple[str, str, int], txts_to_translate: List[str]
+    ) -> List[str]:
+        return self._generate_translations(txts_to_translate, *key)
+
+    def _generate_translations(
+        self,
+        txts_to_translate: List[str],
+        src_lang: str,
+        tgt_lang: str,
+        batch_size: int,
+    ) -> List[str]:
+        if not txts_to_translate:
+            return []
+
+        # Count the tokens of the inputs, bounding the length of their translations
+        with span("tokenize"):
+            input_lengths = [
+                len(ids)
+                for ids in self.translator.tokenizer(
+                    txts_to_translate, add_special_tokens=False
+                )["input_ids"]
+            ]
+
+        # Sort texts by length, so that batches need as little padding as possible
+        order = sorted(range(len(txts_to_translate)), key=lambda i: input_lengths[i])
+
+        translated_texts = [None] * len(txts_to_translate)
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            # The pipeline tokenizes, generates and decodes in a single call
+            with span("translation"), _translator_lock:
+                translations = self.translator(
+                    [txts_to_translate[i] for i in batch],
+                    src_lang=src_lang,
+                    tgt_lang=tgt_lang,
+                    batch_size=len(batch),
+                    max_new_tokens=self.policy.translation_max_new_tokens(
+                        input_lengths[batch[-1]], self.translation_max_length
+                    ),
+                )
+            GENERATE_BATCH_SIZE.observe(len(batch), model=TRANSLATION_MODEL_NAME)
+
+            for i, translation in zip(batch, translations):
+                translated_text = translation["translation_text"]
+
+                # If something goes wrong with the translation raise error
+                if len(translated_text) <= 0:
+                    raise RuntimeError("Failed to generate translation.")
+
+                translated_texts[i] = translated_text
+
+            # The pipeline returns texts, their tokens are counted once more
+            TOKENS.inc(
+                sum(input_lengths[i] for i in batch),
+                model=TRANSLATION_MODEL_NAME,
+                direction="in",
+            )
+            TOKENS.inc(
+                sum(
+                    len(ids)
+                    for ids in self.translator.tokenizer(
+                        [translated_texts[i] for i in batch], add_special_tokens=False
+                    )["input_ids"]
+                ),
+                model=TRANSLATION_MODEL_NAME,
+                direction="out",
+            )
+
+        return translated_texts
+
+    def _clean_stage(self, batch: Dict) -> Dict:
+        """Pipeline stage extracting the text of the entries' contents"""
+        with span("clean"):
+            batch["contents"] = [
+                self.extract_text(
+                    entry.get(
+                        "summary", entry.get("content", entry.get("description", ""))
+                    )
+                )
+                for entry in batch["entries"]
+            ]
+        return batch
+
+    def _pre_translate_stage(self, batch: Dict) -> Dict:
+        """Pipeline stage translating the contents to the language they are summarized in"""
+
+        # If source language is not the summaries' one (English when pivoting), first translate contents
+        if batch["src_lang"] != batch["summary_lang"]:
+            batch["contents"] = self.translate_batch(
+                batch["contents"],
+                src_lang=batch["src_lang"],
+                tgt_lang=batch["summary_lang"],
+            )
+        return batch
+
+    def _summarize_stage(self, batch: Dict) -> Dict:
+        """Pipeline stage summarizing the contents"""
+        batch["summaries"] = self.summarize_batch(
+            batch["contents"],
+            max_length=30,
+            min_length=10,
+            model_key=batch["summarization_model_key"],
+            interactive=batch["interactive"],
+        )
+        return batch
+
+    def _translate_stage(self, batch: Dict) -> List[ProcessedEntry]:
+        """Pipeline stage translating the titles and summaries, building the processed entries"""
+        entries, tgt_lang = batch["entries"], batch["tgt_lang"]
+
+        # Translate the titles and summarized contents of all entries in batches
+        translated_titles = self.translate_batch(
+            [entry.get("title", "") for entry in entries],
+            src_lang=batch["src_lang"],
+            tgt_lang=tgt_lang,
+        )
+
+        # Unless the target language is already the summaries' language, translate them
+        translated_contents = (
+            self.translate_batch(
+                batch["summaries"], src_lang=batch["summary_lang"], tgt_lang=tgt_lang
+            )
+            if tgt_lang != batch["summary_lang"]
+            else batch["summaries"]
+        )
+
+        # Only the shown fields are kept, not the raw entries' contents
+        return [
+            ProcessedEntry(
+                title=translated_title,
+                summary=translated_content,
+                author=entry.get("author", ""),
+                link=entry.get("link", ""),
+                language=tgt_lang,
+                source_id=_entry_id(entry),
+            )
+            for entry, translated_title, translated_content in zip(
+                entries, translated_titles, translated_contents
+            )
+        ]
+
+    def _new_batch(
+        self,
+        entries: List[Dict],
+        src_lang: str,
+        tgt_lang: str,
+        interactive: bool = False,
+    ) -> Dict:
+        """Build the payload carried by a chunk of entries through the pipeline stages"""
+        src_lang = LANGUAGES.get(src_lang, src_lang)
+        default_lang = LANGUAGES.get("en", "en")
+
+        # The language the contents are summarized in, and the model summarizing them
+        summary_lang = default_lang if self.strategy == "pivot" else src_lang
+        summarization_model_key = (
+            MULTILINGUAL_SUMMARIZATION_MODEL_KEY
+            if self.strategy == "multilingual" and src_lang != default_lang
+            else SUMMARIZATION_MODEL_KEY
+        )
+
+        # Pivot through English when the model cannot summarize the contents' language directly
+        if (
+            summary_lang
+            not in SUMMARIZATION_MODEL_LANGUAGES[MODEL_NAMES[summarization_model_key]]
+        ):
+            logger.debug(
+                f"No {self.strategy} summarization of {src_lang} contents, pivoting through {default_lang}"
+            )
+            summary_lang = default_lang
+            summarization_model_key = SUMMARIZATION_MODEL_KEY
+
+        return {
+            "entries": entries,
+            "src_lang": src_lang,
+            "tgt_lang": LANGUAGES.get(tgt_lang, tgt_lang),
+            "summary_lang": summary_lang,
+            "summarization_model_key": summarization_model_key,
+            "interactive": interactive,
+        }
+
+    @timed("process_entries")
+    def process_entries(
+        self,
+        entries: List[Dict],
+        src_lang: str,
+        tgt_lang: str,
+        interactive: bool = False,
+    ) -> List[ProcessedEntry]:
+        """Process the given feed entries keeping the important information,
+        summarizing and translating it
+
+        Args:
+            entries (List[Dict]): the raw feed entries, as parsed by feedparser
+            src_lang (str): the entries' initial language
+            tgt_lang (str): the target language to which the content will be translated
+            interactive (bool, optional): whether a user is waiting for the entries. Defaults to False.
+
+        Returns:
+            List[ProcessedEntry]: the processed entries, each one containing the processed info regarding
+            title, author, summary and link for the respective feed entry
+        """
+        if not entries:
+            return []
+
+        batch = self._new_batch(entries, src_lang, tgt_lang, interactive)
+        for _, stage in self.pipeline.stages:
+            batch = stage(batch)
+        return batch
+
+    def iter_process_entries(
+        self,
+        entries_chunks: Iterable[List[Dict]],
+        src_lang: str,
+        tgt_lang: str,
+        interactive: bool = False,
+    ) -> Iterator[List[ProcessedEntry]]:
+        """Process chunks of feed entries through the staged pipeline, so that the next
+        chunk is cleaned and pre-translated while the current one is being summarized,
+        or, with a worker pool, spread the chunks across the worker processes
 
-        return translated_text
+        Args:
+            entries_chunks (Iterable[List[Dict]]): the chunks of raw feed entries
+            src_lang (str): the entries' initial language
+            tgt_lang (str): the target language to which the content will be translated
+            interactive (bool, optional): whether a user is waiting for the entries. Defaults to False.
+
+        Yields:
+            List[ProcessedEntry]: the processed entries of each chunk, in input order
+        """
+        if self.worker_pool is not None:
+            yield from self.worker_pool.iter_process_entries(
+                entries_chunks, src_lang, tgt_lang, interactive
+            )
+            return
+
+        yield from self.pipeline.run(
+            self._new_batch(entries, src_lang, tgt_lang, interactive)
+            for entries in entries_chunks
+        )
 
     def parse_and_process_feed(
         self,
@@ -178,9 +1133,10 @@ class TaskManager:
         src_lang: str,
         tgt_lang: str,
         entries_limit: int = None,
-    ) -> List[Dict]:
+    ) -> List[ProcessedEntry]:
         """Parse the input feed, and process the feed entries keeping the important information,
-        summarizing and translating it
+        summarizing and translating it. With a feed state store, the feed is requested
+        conditionally and only entries not seen before are processed.
 
         Args:
             rss_url (HttpUrl): the feed url to parse
@@ -189,62 +1145,277 @@ class TaskManager:
             entries_limit (int, optional): the number of feed-entries to be processed. Defaults to None (process all).
 
         Returns:
-            List[Dict]: a list of dictionaries, each one containing the processed info regarding
-            title, author, content and link for the respective feed entry
+            List[ProcessedEntry]: the processed entries, each one containing the processed info regarding
+            title, author, summary and link for the respective feed entry
         """
+        return [
+            entry
+            for processed_entries in self.iter_parse_and_process_feed(
+                rss_url, src_lang, tgt_lang, entries_limit
+            )
+            for entry in processed_entries
+        ]
 
-        src_lang = LANGUAGES.get(src_lang, src_lang)
-        tgt_lang = LANGUAGES.get(tgt_lang, tgt_lang)
-        default_lang = LANGUAGES.get("en", "en")
+    @staticmethod
+    def _fetch_feed(rss_url: HttpUrl, **kw):
+        """Fetch and parse a feed, both done by a single feedparser call
+
+        Raises:
+            RuntimeError: error in case the feed could not be fetched
+        """
+        with span("fetch_parse"):
+            feed = feedparser.parse(rss_url, **kw)
 
-        feed = feedparser.parse(rss_url)
+        # feedparser does not raise, a network error is flagged as bozo (with no entries)
+        # and an HTTP error is only reported in the status
+        status = feed.get("status")
+        if (status or 0) >= 400 or (
+            feed.get("bozo") and not feed.entries and status != 304
+        ):
+            reason = feed.get("bozo_exception") or f"HTTP status {status}"
+            raise RuntimeError(f"Failed to fetch feed {rss_url}: {reason}")
+        return feed
 
-        # Return the maximum number of entries in case entries is None or exceeding entries length
-        processed_entries = feed.entries[:entries_limit]
+    def iter_parse_and_process_feed(
+        self,
+        rss_url: HttpUrl,
+        src_lang: str,
+        tgt_lang: str,
+        entries_limit: int = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        interactive: bool = False,
+    ) -> Iterator[List[ProcessedEntry]]:
+        """Generator variant of parse_and_process_feed, yielding the processed entries
+        chunk by chunk, in feed order, as soon as each chunk is ready
 
-        # Iterate over each entry in the feed
-        for entry in processed_entries:
-            title = entry.get("title", "")
-            author = entry.get("author", "")
-            link = entry.get("link", "")
-            content = entry.get(
-                "summary", entry.get("content", entry.get("description", ""))
-            )
+        Args:
+            rss_url (HttpUrl): the feed url to parse
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language to which the content will be translated
+            entries_limit (int, optional): the number of feed-entries to be processed. Defaults to None (process all).
+            chunk_size (int, optional): the max number of entries per yielded chunk. Defaults to STREAM_CHUNK_SIZE.
+            interactive (bool, optional): whether a user is waiting for the entries, trading
+                quality for latency. Defaults to False.
 
-            soup = BeautifulSoup(content, features="html.parser")
-            content = "".join(soup.findAll(text=True))
+        Yields:
+            List[ProcessedEntry]: the processed entries of the next chunk of the feed
+        """
+        try:
+            if self.feed_state is None:
+                feed = self._fetch_feed(rss_url)
 
-            # If source language is not English, first translate it to English to summarize
-            if src_lang != default_lang:
-                content = self.translate(
-                    content, src_lang=src_lang, tgt_lang=default_lang
+                # Return the maximum number of entries in case entries is None or exceeding entries length
+                entries = feed.entries[:entries_limit]
+                yield from self.iter_process_entries(
+                    (
+                        entries[start : start + chunk_size]
+                        for start in range(0, len(entries), chunk_size)
+                    ),
+                    src_lang,
+                    tgt_lang,
+                    interactive,
                 )
+            else:
+                yield from self._iter_parse_and_process_feed_incrementally(
+                    rss_url, src_lang, tgt_lang, entries_limit, chunk_size, interactive
+                )
+        finally:
+            if self.cache is not None:
+                logger.info(f"Result cache stats: {self.cache.stats()}")
+            if self.summarize_batcher is not None:
+                logger.info(f"Micro-batching stats: {self.batching_stats()}")
+
+    def parse_and_process_feeds(
+        self,
+        feeds: List[Tuple[HttpUrl, str, str]],
+        entries_limit: int = None,
+    ) -> List[Dict]:
+        """Parse many feeds, fetched concurrently, and process the entries of all of them
+        in a single batched inference stage
 
-            # Summarize the content
-            summarized_content = self.summarize(content, max_length=30, min_length=10)
+        Args:
+            feeds (List[Tuple[HttpUrl, str, str]]): the (feed url, source language, target language) of each feed
+            entries_limit (int, optional): the number of entries to be processed per feed. Defaults to None (process all).
 
-            # Translate the title and summarized content
-            translated_title = self.translate(
-                title, src_lang=src_lang, tgt_lang=tgt_lang
-            )
+        Returns:
+            List[Dict]: per input feed (in input order), a dictionary with the feed url, the languages,
+            the processed entries and the error message in case the feed could not be processed
+        """
+        return asyncio.run(ingest_feeds(self, feeds, entries_limit))
+
+    def get_stored_entries(
+        self,
+        rss_url: HttpUrl,
+        src_lang: str,
+        tgt_lang: str,
+        entries_limit: int = None,
+    ) -> Optional[List[ProcessedEntry]]:
+        """Get the processed entries of a feed from the feed state store, without fetching it
+
+        Args:
+            rss_url (HttpUrl): the feed url
+            src_lang (str): the feed's initial language
+            tgt_lang (str): the target language of the processed entries
+            entries_limit (int, optional): the number of feed-entries to return. Defaults to None (return all).
+
+        Returns:
+            Optional[List[ProcessedEntry]]: the processed entries, in feed order, None in case the store
+            holds no entries or not all the requested ones
+        """
+        if self.feed_state is None:
+            return None
+
+        # A state without entries (e.g. saved from a failed fetch) is no result to serve
+        state = self.feed_state.get_feed(rss_url, src_lang, tgt_lang)
+        if state is None or not state["entry_ids"]:
+            return None
+
+        entry_ids = state["entry_ids"][:entries_limit]
+        stored_entries = self.feed_state.get_entries(
+            rss_url, src_lang, tgt_lang, entry_ids
+        )
+        if len(stored_entries) < len(entry_ids):
+            return None
+
+        return [stored_entries[entry_id] for entry_id in entry_ids]
+
+    def _iter_parse_and_process_feed_incrementally(
+        self,
+        rss_url: HttpUrl,
+        src_lang: str,
+        tgt_lang: str,
+        entries_limit: int,
+        chunk_size: int,
+        interactive: bool,
+    ) -> Iterator[List[ProcessedEntry]]:
+        state = self.feed_state.get_feed(rss_url, src_lang, tgt_lang)
 
-            # Unless the target language is already the default, translate it
-            translated_content = (
-                self.translate(
-                    summarized_content, src_lang=default_lang, tgt_lang=tgt_lang
+        # Conditional request, using the validators of the previous response
+        if state is not None:
+            try:
+                feed = self._fetch_feed(
+                    rss_url, etag=state["etag"], modified=state["modified"]
                 )
-                if tgt_lang != default_lang
-                else summarized_content
-            )
+            except RuntimeError as e:
+                # The stored state is left untouched, and served while the feed is unavailable
+                stored_entries = self.get_stored_entries(
+                    rss_url, src_lang, tgt_lang, entries_limit
+                )
+                if stored_entries is None:
+                    raise
+                logger.warning(f"{e}, serving the stored entries")
+                yield stored_entries
+                return
 
-            # Update entry
-            entry.update(
-                {
-                    "title": translated_title,
-                    "content": translated_content,
-                    "author": author,
-                    "link": link,
-                }
+            if feed.get("status") == 304:
+                # Serve the stored results, unless they do not cover the requested entries
+                stored_entries = self.get_stored_entries(
+                    rss_url, src_lang, tgt_lang, entries_limit
+                )
+                if stored_entries is not None:
+                    logger.debug(f"Feed {rss_url} not modified")
+                    yield stored_entries
+                    return
+
+                feed = self._fetch_feed(rss_url)
+        else:
+            feed = self._fetch_feed(rss_url)
+
+        all_entry_ids = [_entry_id(entry) for entry in feed.entries]
+
+        # Return the maximum number of entries in case entries is None or exceeding entries length
+        entries = feed.entries[:entries_limit]
+        entry_ids = all_entry_ids[:entries_limit]
+
+        stored_entries = self.feed_state.get_entries(
+            rss_url, src_lang, tgt_lang, entry_ids
+        )
+        logger.debug(
+            f"Feed {rss_url}: {len(entry_ids) - len(stored_entries)} new of {len(entry_ids)} entries"
+        )
+
+        # Run inference only on the entries not seen before
+        chunks = []
+        for start in range(0, len(entries), chunk_size):
+            chunk_ids = entry_ids[start : start + chunk_size]
+            new_entries = {
+                entry_id: entry
+                for entry_id, entry in zip(
+                    chunk_ids, entries[start : start + chunk_size]
+                )
+                if entry_id not in stored_entries
+            }
+            chunks.append((chunk_ids, new_entries))
+
+        processed_chunks = self.iter_process_entries(
+            (list(new_entries.values()) for _, new_entries in chunks),
+            src_lang,
+            tgt_lang,
+            interactive,
+        )
+        for processed_entries, (chunk_ids, new_entries) in zip(
+            processed_chunks, chunks
+        ):
+            processed_new_entries = dict(zip(new_entries, processed_entries))
+            self.feed_state.save_entries(
+                rss_url, src_lang, tgt_lang, processed_new_entries
             )
+            stored_entries.update(processed_new_entries)
+
+            yield [stored_entries[entry_id] for entry_id in chunk_ids]
+
+        # Validators are saved only once all the requested entries have been processed
+        self.feed_state.save_feed(
+            rss_url,
+            src_lang,
+            tgt_lang,
+            feed.get("etag"),
+            feed.get("modified"),
+            all_entry_ids,
+        )
+
+
+def _entry_id(entry: Dict) -> str:
+    """Get the id identifying a feed entry across refreshes
 
-        return processed_entries
+    Args:
+        entry (Dict): the raw feed entry
+
+    Returns:
+        str: the entry's GUID, or its link, or a hash of its title and content otherwise
+    """
+    entry_id = entry.get("id") or entry.get("link")
+    if entry_id:
+        return entry_id
+
+    return ResultCache.make_key(
+        entry.get("title", ""),
+        entry.get("summary", entry.get("description", "")),
+    )
+
+
+_task_manager = None
+_task_manager_lock = threading.Lock()
+
+
+def get_task_manager() -> TaskManager:
+    """Get the process-wide task manager, creating it on first call
+
+    Returns:
+        TaskManager: the task manager shared across requests
+    """
+    global _task_manager
+
+    if _task_manager is None:
+        with _task_manager_lock:
+            if _task_manager is None:
+                _task_manager = TaskManager(
+                    cache=ResultCache(
+                        CACHE_DB_PATH,
+                        memory_max_entries=CACHE_MEMORY_MAX_ENTRIES,
+                        disk_max_entries=CACHE_DISK_MAX_ENTRIES,
+                    ),
+                    feed_state=FeedStateStore(FEED_STATE_DB_PATH),
+                )
+                REGISTRY.register_collector(_task_manager.collect_metrics)
+    return _task_manager
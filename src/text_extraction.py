@@ -0,0 +1,163 @@
+import logging
+import re
+
+from typing import Callable, Dict
+
+from bs4 import BeautifulSoup, Comment
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional, BeautifulSoup is the fallback
+    etree = lxml_html = None
+
+
+logger = logging.getLogger("src.text_extraction")
+
+
+# Elements whose content never reaches the tokenizer
+BOILERPLATE_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "iframe",
+    "object",
+    "embed",
+    "svg",
+    "form",
+    "button",
+    "nav",
+    "aside",
+    "footer",
+)
+
+# Elements whose boundaries are kept as paragraph breaks in the extracted text
+BLOCK_TAGS = frozenset(
+    (
+        "p",
+        "div",
+        "ul",
+        "ol",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "blockquote",
+        "pre",
+        "table",
+        "section",
+        "article",
+        "figure",
+        "figcaption",
+        "header",
+    )
+)
+
+# Elements whose boundaries are kept as line breaks in the extracted text
+LINE_TAGS = frozenset(("br", "li", "tr", "dt", "dd"))
+
+# Elements whose boundaries are kept as spaces in the extracted text
+CELL_TAGS = frozenset(("td", "th"))
+
+_SPACES_RE = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*")
+
+
+def _normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines, keeping paragraph breaks"""
+    text = _SPACES_RE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def extract_text_bs4(content: str) -> str:
+    """Extract the text of an HTML fragment with BeautifulSoup's pure-Python html.parser
+
+    Args:
+        content (str): the HTML content
+
+    Returns:
+        str: the extracted text
+    """
+    soup = BeautifulSoup(content, features="html.parser")
+    for element in soup.find_all(BOILERPLATE_TAGS):
+        element.decompose()
+    return _normalize_whitespace(
+        "".join(
+            text for text in soup.find_all(string=True) if not isinstance(text, Comment)
+        )
+    )
+
+
+def extract_text_lxml(content: str) -> str:
+    """Extract the text of an HTML fragment with lxml's C parser, streaming over
+    the parsed tree and keeping block boundaries as paragraph breaks
+
+    Args:
+        content (str): the HTML content
+
+    Returns:
+        str: the extracted text
+    """
+    if not content or not content.strip():
+        return ""
+
+    try:
+        root = lxml_html.fragment_fromstring(content, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return extract_text_bs4(content)
+
+    etree.strip_elements(root, etree.Comment, *BOILERPLATE_TAGS, with_tail=False)
+
+    # Break lines around blocks, runs of breaks are collapsed afterwards
+    parts = []
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        if event == "start":
+            if element.tag in BLOCK_TAGS:
+                parts.append("\n\n")
+            if element.text:
+                parts.append(element.text)
+            continue
+
+        if element.tag in BLOCK_TAGS:
+            parts.append("\n\n")
+        elif element.tag in LINE_TAGS:
+            parts.append("\n")
+        elif element.tag in CELL_TAGS:
+            parts.append(" ")
+        if element.tail and element is not root:
+            parts.append(element.tail)
+
+    return _normalize_whitespace("".join(parts))
+
+
+# The available text extractors, by name
+TEXT_EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    "bs4": extract_text_bs4,
+    "lxml": extract_text_lxml,
+}
+
+
+def get_text_extractor(name: str) -> Callable[[str], str]:
+    """Get a text extractor by name, falling back to BeautifulSoup when lxml is not installed
+
+    Args:
+        name (str): the name of the extractor, one of TEXT_EXTRACTORS
+
+    Raises:
+        RuntimeError: error in case of unknown extractor
+
+    Returns:
+        Callable[[str], str]: the text extractor
+    """
+    if name not in TEXT_EXTRACTORS:
+        raise RuntimeError(f"Unknown text extractor '{name}'.")
+
+    if name == "lxml" and lxml_html is None:
+        logger.warning("lxml is not installed, falling back to BeautifulSoup")
+        return extract_text_bs4
+
+    return TEXT_EXTRACTORS[name]
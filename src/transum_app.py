@@ -1,12 +1,85 @@
-import gradio as gr
+from time import perf_counter
+
+# The cold start is measured from here
+_started = perf_counter()
+
+import gradio as gr  # noqa: E402
 
 # import spaces
 
-from typing import Dict, List, Tuple
-from pydantic import HttpUrl
+from typing import Iterator, List, Tuple  # noqa: E402
+from pydantic import HttpUrl  # noqa: E402
+
+from config import (  # noqa: E402
+    API_PORT,
+    JOB_QUEUE_MAX_DEPTH,
+    JOB_QUEUE_WORKERS,
+    LANGUAGES,
+    METRICS_PORT,
+    POLL_BUDGET_WINDOW,
+    POLL_DEFAULT_INTERVAL,
+    POLL_INFERENCE_BUDGET,
+    POLL_JITTER,
+    STARTUP_BUDGET,
+    SUBSCRIPTIONS_FILE,
+    WORKER_POOL_SIZE,
+)
+from feed_poller import FeedPoller, load_subscriptions  # noqa: E402
+from entries import ProcessedEntry  # noqa: E402
+from job_queue import INTERACTIVE, JobQueue  # noqa: E402
+from json_api import JsonApiServer  # noqa: E402
+from metrics import REGISTRY, start_metrics_server  # noqa: E402
+from startup import Startup  # noqa: E402
+
+
+# The services serving the requests, created by the startup steps
+services = {}
+
+
+def _import_task_management() -> None:
+    # Deferred, as importing torch, transformers and feedparser takes seconds
+    from task_management import get_task_manager
+
+    services["task_manager"] = get_task_manager()
+
+
+def _load_models() -> None:
+    services["task_manager"].warm_up()
+
+
+def _start_services() -> None:
+    # Runs the feed processing requests, coalescing identical ones
+    job_queue = JobQueue(
+        services["task_manager"],
+        max_depth=JOB_QUEUE_MAX_DEPTH,
+        workers=JOB_QUEUE_WORKERS,
+    )
+
+    # Keeps the subscribed feeds processed in the background
+    feed_poller = FeedPoller(
+        job_queue,
+        load_subscriptions(SUBSCRIPTIONS_FILE),
+        default_interval=POLL_DEFAULT_INTERVAL,
+        jitter=POLL_JITTER,
+        inference_budget=POLL_INFERENCE_BUDGET,
+        budget_window=POLL_BUDGET_WINDOW,
+    )
+
+    job_queue.start()
+    feed_poller.start()
+    REGISTRY.register_collector(job_queue.collect_metrics)
+    services.update(job_queue=job_queue, feed_poller=feed_poller)
 
-from task_management import TaskManager
-from config import LANGUAGES
+
+startup = Startup(
+    [
+        ("import", _import_task_management),
+        ("load_models", _load_models),
+        ("start_services", _start_services),
+    ],
+    budget=STARTUP_BUDGET,
+    started=_started,
+)
 
 
 # Gradio interface
@@ -16,9 +89,9 @@ def process_rss(
     source_lang: str,
     target_lang: str,
     entries_limit: int = None,
-) -> List[Dict]:
+) -> Iterator[Tuple[List[ProcessedEntry], int]]:
     """The wrapper to the respective task management function to retrieve the
-    summarized and translated entries from the feed
+    summarized and translated entries from the feed, as soon as they are ready
 
     Args:
         rss_url (HttpUrl): the url
@@ -29,19 +102,38 @@ def process_rss(
     Raises:
         gr.Error: _description_
 
-    Returns:
-        List[Dict]: _description_
+    Yields:
+        Tuple[List[ProcessedEntry], int]: the entries processed so far and their number
     """
+    processed_entries = []
     try:
-        tm = TaskManager()
-        processed_entries = tm.parse_and_process_feed(
-            rss_url, source_lang, target_lang, entries_limit
+        if not startup.is_ready():
+            raise RuntimeError(startup.status())
+        tm = services["task_manager"]
+        job_queue, feed_poller = services["job_queue"], services["feed_poller"]
+
+        # Subscribed feeds are served from the store, kept fresh in the background
+        if feed_poller.is_subscribed(rss_url, source_lang, target_lang):
+            stored_entries = tm.get_stored_entries(
+                rss_url, source_lang, target_lang, entries_limit
+            )
+            if stored_entries is not None:
+                yield stored_entries, len(stored_entries)
+                return
+
+        job = job_queue.submit(
+            rss_url, source_lang, target_lang, entries_limit, priority=INTERACTIVE
         )
+        for entries_chunk in job.iter_chunks():
+            processed_entries = processed_entries + entries_chunk
+            yield processed_entries, len(processed_entries)
+
+        # Feed without entries, still report it
+        if not processed_entries:
+            yield processed_entries, 0
     except Exception as e:
         raise gr.Error(e)
 
-    return processed_entries, len(processed_entries)
-
 
 # Custom css
 custom_css = """
@@ -67,6 +159,9 @@ with gr.Blocks(
         "Input an RSS feed URL and specify the source and target languages to get summarized and translated content."
     )
 
+    # Startup status, as of the page load
+    gr.Markdown(lambda: f"*{startup.status()}*")
+
     rss_entries = gr.State([])
 
     with gr.Row():
@@ -114,10 +209,12 @@ with gr.Blocks(
                 tgt_lang: str,
                 entries_limit: int,
                 latest_entries_num: int,
-            ) -> Tuple[List[Dict], int, str]:
-                """Calls format_processed_entries and format_processed_entries,
+                view_entries_num: int,
+            ) -> Iterator[Tuple[List[ProcessedEntry], int, str]]:
+                """Calls process_rss and format_processed_entries,
                 everytime submit button is pressed in order to retrieve feed entries,
-                format them and show them in the respective output component
+                format them and show them in the respective output component,
+                growing the output as more entries are processed
 
                 Args:
                     feed_url (HttpUrl): the feed url
@@ -125,17 +222,20 @@ with gr.Blocks(
                     tgt_lang (str): target_language
                     entries_limit (int): the entries' limit (to retrieve)
                     latest_entries_num (int): the number of the latest entries retrieved (if submission button has been pressed before)
+                    view_entries_num (int): the max number of entries to view
 
-                Returns:
-                    Tuple[List[Dict], int, str]: the feed entries retrieved, the number of those entries, the entries properly formatted
+                Yields:
+                    Tuple[List[ProcessedEntry], int, str]: the feed entries retrieved so far, the number of those entries, the entries properly formatted
                 """
 
-                proc_entries, entries_num = process_rss(
+                for proc_entries, entries_num in process_rss(
                     feed_url, src_lang, tgt_lang, entries_limit
-                )
-                # entries_updated = update_entries(latest_entries_num)
-                formatted_updated_entries = format_processed_entries(proc_entries)
-                return proc_entries, entries_num, formatted_updated_entries
+                ):
+                    # entries_updated = update_entries(latest_entries_num)
+                    formatted_updated_entries = format_processed_entries(
+                        proc_entries, view_entries_num
+                    )
+                    yield proc_entries, entries_num, formatted_updated_entries
 
             with gr.Tab("Feed Summaries:", visible=True, elem_id="entriesTab"):
                 # Create a scrollable Markdown component
@@ -156,12 +256,12 @@ with gr.Blocks(
                     outputs=[markdown_output],
                 )
                 def format_processed_entries(
-                    processed_entries: List[Dict], entries_limit: int = None
+                    processed_entries: List[ProcessedEntry], entries_limit: int = None
                 ) -> str:
-                    """Format the output entries
+                    """Format the output entries, rendering only the ones viewed
 
                     Args:
-                        processed_entries (List[Dict]): the entries retrieved from the feed that have been processed
+                        processed_entries (List[ProcessedEntry]): the entries retrieved from the feed that have been processed
                         entries_limit (int): a limit for the entries to view
 
                     Returns:
@@ -170,17 +270,10 @@ with gr.Blocks(
                     entries_limit = entries_limit or len(processed_entries) or None
 
                     # Format the output for Gradio
-                    output = ""
-                    for entry in processed_entries[:entries_limit]:
-                        output += f"### {entry.get('title', '---')}\n\n"
-                        output += f"**Author:** {entry.get('author', '-')}\n\n"
-                        output += f"{entry.get('content', '')}\n\n"
-                        link = entry.get("link", "")
-                        if link:
-                            output += f"[Read more]({link})\n\n"
-                        output += "---\n\n"
-
-                    return output
+                    return "".join(
+                        entry.to_markdown()
+                        for entry in processed_entries[:entries_limit]
+                    )
 
                 # Function to handle dropdown options for viewing entries
                 @gr.on(
@@ -188,11 +281,13 @@ with gr.Blocks(
                     inputs=[rss_entries],
                     outputs=[entries_to_view],
                 )
-                def update_view_dropdown(view_entries: List[Dict]) -> gr.Dropdown:
+                def update_view_dropdown(
+                    view_entries: List[ProcessedEntry],
+                ) -> gr.Dropdown:
                     """Update the options for view dropdown
 
                     Args:
-                        view_entries (List[Dict]): the view entries list
+                        view_entries (List[ProcessedEntry]): the view entries list
 
                     Returns:
                         gr.Dropdown: a dropdown component with the updated options regarding view entries
@@ -212,7 +307,14 @@ with gr.Blocks(
     # Link the function to the button
     submit_btn.click(
         submit_request,
-        inputs=[rss_url, source_lang, target_lang, entries_to_retrieve, message_output],
+        inputs=[
+            rss_url,
+            source_lang,
+            target_lang,
+            entries_to_retrieve,
+            message_output,
+            entries_to_view,
+        ],
         outputs=[rss_entries, message_output, markdown_output],
     )
 
@@ -228,5 +330,33 @@ with gr.Blocks(
         ]
     )
 
-# Launch the interface
-demo.launch()
+
+def main() -> None:
+    """Start the app: the interface, the JSON API and the metrics endpoint, next to the
+    models loading and the services starting in the background
+    """
+    # Load the models once, then start running requests and refreshing the subscribed feeds
+    if WORKER_POOL_SIZE > 1:
+        # The worker processes are forked once the models are loaded, before any other thread starts
+        startup.run()
+    else:
+        # Bind the interface right away, while the models load in the background
+        startup.start()
+
+    # Expose the metrics and readiness for Prometheus and the load balancer, next to the interface
+    REGISTRY.register_collector(startup.collect_metrics)
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT, ready=startup.is_ready)
+
+    # Serve the headless clients, through the job queue of the interface
+    if API_PORT:
+        JsonApiServer(
+            API_PORT, lambda: services["job_queue"], ready=startup.is_ready
+        ).start()
+
+    # Launch the interface
+    demo.launch()
+
+
+if __name__ == "__main__":
+    main()
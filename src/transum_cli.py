@@ -0,0 +1,126 @@
+"""Headless use of the feed summarizer and translator, without the Gradio interface.
+
+Batch mode reads feed requests as JSON lines, e.g.
+{"rss_url": "https://...", "src_lang": "el", "tgt_lang": ["en", "fr"]}
+and writes one NDJSON result per feed and language pair, as soon as it is processed:
+
+    python transum_cli.py batch --input feeds.jsonl --output results.jsonl [--entries-limit 10]
+    python transum_cli.py batch --feed https://... el en
+
+Serve mode runs the JSON API (POST /process, GET /ready) alone:
+
+    python transum_cli.py serve [--port 8000]
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from typing import Iterable, List, Tuple
+
+from config import API_PORT, FEEDS_BATCH_SIZE, JOB_QUEUE_MAX_DEPTH, JOB_QUEUE_WORKERS
+from job_queue import JobQueue
+from json_api import JsonApiServer, iter_feed_results, parse_feed_requests, to_ndjson
+from task_management import get_task_manager
+
+
+logger = logging.getLogger("src.transum_cli")
+
+
+def _read_feed_requests(lines: Iterable[str]) -> List[Tuple[str, str, str]]:
+    records = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_num}: {e}")
+    return parse_feed_requests(records)
+
+
+def batch(args: argparse.Namespace) -> None:
+    feeds = [tuple(feed) for feed in args.feed or []]
+    if args.input:
+        with (
+            sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        ) as f:
+            feeds += _read_feed_requests(f)
+    if not feeds:
+        sys.exit("No feeds to process, use --input or --feed.")
+
+    # One long-lived task manager, with its result cache and feed state, for the whole backlog
+    task_manager = get_task_manager()
+    task_manager.warm_up()
+
+    output = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    failed = 0
+    try:
+        for result in iter_feed_results(
+            task_manager.parse_and_process_feeds,
+            feeds,
+            args.entries_limit,
+            args.batch_size,
+        ):
+            output.write(to_ndjson(result))
+            output.flush()
+            failed += result["error"] is not None
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    logger.info(f"Processed {len(feeds)} feeds, {failed} failed")
+
+
+def serve(args: argparse.Namespace) -> None:
+    task_manager = get_task_manager()
+    task_manager.warm_up()
+
+    # Requests are processed one batch at a time, as in the application
+    job_queue = JobQueue(
+        task_manager, max_depth=JOB_QUEUE_MAX_DEPTH, workers=JOB_QUEUE_WORKERS
+    )
+    job_queue.start()
+
+    server = JsonApiServer(args.port, lambda: job_queue)
+    logger.info(f"Serving the JSON API on port {args.port}")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = commands.add_parser(
+        "batch", help="process many feeds, writing NDJSON results"
+    )
+    batch_parser.add_argument(
+        "--input", help="JSON lines file of the feed requests, - for stdin"
+    )
+    batch_parser.add_argument(
+        "--feed",
+        nargs=3,
+        action="append",
+        metavar=("RSS_URL", "SRC_LANG", "TGT_LANG"),
+        help="a feed to process, can be repeated",
+    )
+    batch_parser.add_argument(
+        "--output", default="-", help="NDJSON results file, - for stdout"
+    )
+    batch_parser.add_argument("--entries-limit", type=int)
+    batch_parser.add_argument("--batch-size", type=int, default=FEEDS_BATCH_SIZE)
+    batch_parser.set_defaults(run=batch)
+
+    serve_parser = commands.add_parser("serve", help="run the JSON API")
+    serve_parser.add_argument("--port", type=int, default=API_PORT or 8000)
+    serve_parser.set_defaults(run=serve)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
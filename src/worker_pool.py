@@ -0,0 +1,153 @@
+import logging
+import multiprocessing
+import os
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import torch
+
+from entries import ProcessedEntry
+from metrics import REGISTRY
+
+
+logger = logging.getLogger("src.worker_pool")
+
+
+# The task manager of the worker process, created by the pool's initializer
+_worker_task_manager = None
+
+
+def _core_slices(workers: int) -> List[List[int]]:
+    """Split the cores available to the process in contiguous slices, one per worker"""
+    cores = sorted(os.sched_getaffinity(0))
+    if workers >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(workers)]
+
+    size, extra = divmod(len(cores), workers)
+    slices, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(cores[start:end])
+        start = end
+    return slices
+
+
+def _init_worker(core_slices, task_manager_factory: Callable) -> None:
+    global _worker_task_manager
+
+    cores = core_slices.get()
+    os.sched_setaffinity(0, cores)
+    torch.set_num_threads(len(cores))
+    _worker_task_manager = task_manager_factory()
+    # Only the metrics observed in the worker are sent to the parent, not the forked ones
+    REGISTRY.drain()
+    logger.info(f"Worker {os.getpid()} pinned to cores {cores}")
+
+
+def _process_entries(
+    entries: List[Dict], src_lang: str, tgt_lang: str, interactive: bool
+) -> Tuple[List[ProcessedEntry], Dict[str, Dict]]:
+    processed_entries = _worker_task_manager.process_entries(
+        entries, src_lang, tgt_lang, interactive
+    )
+    # The metrics of the chunk go back with its entries, to be served by the parent
+    return processed_entries, REGISTRY.drain()
+
+
+def _chunk_result(future: Future) -> List[ProcessedEntry]:
+    processed_entries, metrics = future.result()
+    REGISTRY.merge(metrics)
+    return processed_entries
+
+
+class WorkerPool:
+    """Pool of inference processes, each pinned to its own slice of the cores with a matching
+    number of torch threads, processing chunks of feed entries in parallel. The workers are
+    forked from the process the models were loaded in, so they all map the same (read-only)
+    weights copy-on-write, instead of each holding a private copy.
+    """
+
+    def __init__(self, task_manager_factory: Callable, workers: int):
+        """
+        Args:
+            task_manager_factory (Callable): creates the task manager of each worker, given the
+                models already loaded in the parent process, called in the worker after fork
+            workers (int): the number of worker processes
+        """
+        self.task_manager_factory = task_manager_factory
+        self.workers = workers
+
+        self._executor = None
+
+    def start(self) -> None:
+        """Fork the worker processes, once the models to share are loaded
+
+        Raises:
+            RuntimeError: error in case the platform cannot fork, or the models run on the GPU
+        """
+        if self._executor is not None:
+            return
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("The worker pool requires the fork start method.")
+        if torch.cuda.is_available():
+            raise RuntimeError("The worker pool only supports CPU inference.")
+
+        context = multiprocessing.get_context("fork")
+        core_slices = context.Queue()
+        for cores in _core_slices(self.workers):
+            core_slices.put(cores)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(core_slices, self.task_manager_factory),
+        )
+        # With fork, all the workers are forked on the first submission: do it now,
+        # before the process starts any other threads
+        self._executor.submit(os.getpid).result()
+        logger.info(f"Started {self.workers} inference workers")
+
+    def iter_process_entries(
+        self,
+        entries_chunks: Iterable[List[Dict]],
+        src_lang: str,
+        tgt_lang: str,
+        interactive: bool = False,
+    ) -> Iterator[List[ProcessedEntry]]:
+        """Process chunks of feed entries across the workers, keeping one chunk in flight per worker
+
+        Args:
+            entries_chunks (Iterable[List[Dict]]): the chunks of raw feed entries
+            src_lang (str): the entries' initial language
+            tgt_lang (str): the target language to which the content will be translated
+            interactive (bool, optional): whether a user is waiting for the entries. Defaults to False.
+
+        Yields:
+            List[ProcessedEntry]: the processed entries of each chunk, in input order
+        """
+        self.start()
+
+        in_flight = deque()
+        try:
+            for entries in entries_chunks:
+                if len(in_flight) >= self.workers:
+                    yield _chunk_result(in_flight.popleft())
+                in_flight.append(
+                    self._executor.submit(
+                        _process_entries, entries, src_lang, tgt_lang, interactive
+                    )
+                )
+            while in_flight:
+                yield _chunk_result(in_flight.popleft())
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
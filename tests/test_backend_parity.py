@@ -0,0 +1,63 @@
+"""Parity test of the onnx backend against the default PyTorch backend: the summaries and
+translations of the saved feed HTML fixtures (fp32) must be the same with both.
+
+Requires optimum[onnxruntime], skipped otherwise. Run from the project's root directory:
+
+    python -m pytest tests/test_backend_parity.py
+"""
+
+import sys
+
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("optimum.onnxruntime")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from model_registry import ModelRegistry  # noqa: E402
+from task_management import (  # noqa: E402
+    SUMMARIZATION_MODEL_KEY,
+    TRANSLATION_MODEL_KEY,
+    TaskManager,
+    _load_summarization_model,
+    _load_translation_model,
+)
+from text_extraction import extract_text_lxml  # noqa: E402
+
+
+FIXTURES_DIR = (
+    Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "html"
+)
+
+
+def _run(backend: str, sample, tgt_lang: str):
+    registry = ModelRegistry()
+    registry.register(
+        SUMMARIZATION_MODEL_KEY,
+        partial(_load_summarization_model, "fp32", backend),
+    )
+    registry.register(
+        TRANSLATION_MODEL_KEY, partial(_load_translation_model, "fp32", backend)
+    )
+    tm = TaskManager(registry=registry)
+
+    summaries = tm.summarize_batch(sample)
+    translations = tm.translate_batch(summaries, "English", tgt_lang)
+    tm.unload()
+    return summaries, translations
+
+
+def test_onnx_backend_matches_pytorch():
+    sample = [
+        extract_text_lxml(path.read_text(encoding="utf-8"))
+        for path in sorted(FIXTURES_DIR.glob("*.html"))
+    ]
+
+    reference_summaries, reference_translations = _run("pytorch", sample, "French")
+    summaries, translations = _run("onnx", sample, "French")
+
+    assert summaries == reference_summaries
+    assert translations == reference_translations
@@ -0,0 +1,103 @@
+"""Regression tests of the incremental feed refresh: a failed fetch must leave the stored
+state of the feed untouched.
+
+Run from the project's root directory:
+
+    python -m pytest tests
+"""
+
+import functools
+import http.server
+import socket
+import sys
+import threading
+
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from entries import ProcessedEntry  # noqa: E402
+from feed_state import FeedStateStore  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from task_management import TaskManager  # noqa: E402
+
+
+STORED_ENTRIES = {
+    f"urn:entry:{i}": ProcessedEntry(
+        title=f"Title {i}",
+        summary=f"Summary {i}",
+        link=f"https://example.com/{i}",
+        language="English",
+        source_id=f"urn:entry:{i}",
+    )
+    for i in range(5)
+}
+
+
+@pytest.fixture
+def feed_server(tmp_path):
+    """A local HTTP server, serving an empty directory (every feed url is a 404)"""
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(
+            http.server.SimpleHTTPRequestHandler, directory=str(tmp_path)
+        ),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/feed.rss"
+
+
+def _task_manager(tmp_path, rss_url: str) -> TaskManager:
+    feed_state = FeedStateStore(str(tmp_path / "feed_state.sqlite3"))
+    feed_state.save_entries(rss_url, "English", "French", STORED_ENTRIES)
+    feed_state.save_feed(
+        rss_url, "English", "French", '"etag"', None, list(STORED_ENTRIES)
+    )
+    return TaskManager(
+        registry=ModelRegistry(), feed_state=feed_state, micro_batching=False, workers=1
+    )
+
+
+@pytest.mark.parametrize("failure", ["network_error", "http_error"])
+def test_failed_refresh_keeps_stored_feed(tmp_path, feed_server, failure):
+    rss_url = (
+        _closed_port_url() if failure == "network_error" else f"{feed_server}/feed.rss"
+    )
+    tm = _task_manager(tmp_path, rss_url)
+
+    # The stored entries are served while the feed is unavailable
+    assert tm.parse_and_process_feed(rss_url, "English", "French") == list(
+        STORED_ENTRIES.values()
+    )
+
+    state = tm.feed_state.get_feed(rss_url, "English", "French")
+    assert state["etag"] == '"etag"'
+    assert state["entry_ids"] == list(STORED_ENTRIES)
+    assert tm.get_stored_entries(rss_url, "English", "French") == list(
+        STORED_ENTRIES.values()
+    )
+
+
+def test_failed_first_fetch_raises(tmp_path):
+    tm = TaskManager(
+        registry=ModelRegistry(),
+        feed_state=FeedStateStore(str(tmp_path / "feed_state.sqlite3")),
+        micro_batching=False,
+        workers=1,
+    )
+    rss_url = _closed_port_url()
+
+    with pytest.raises(RuntimeError, match="Failed to fetch feed"):
+        tm.parse_and_process_feed(rss_url, "English", "French")
+    assert tm.feed_state.get_feed(rss_url, "English", "French") is None